@@ -0,0 +1,41 @@
+import time
+
+
+class RealTimeClock(object):
+
+    def __init__(self):
+        """
+        Clock that makes the game wait in real time, e.g. while an agent is 'thinking', so a human can follow it.
+        """
+        self.waited = 0  # Total simulated time that was waited for
+
+    def sleep(self, seconds):
+        self.waited += seconds
+        time.sleep(seconds)
+
+
+class AcceleratedClock(RealTimeClock):
+
+    def __init__(self, factor):
+        """
+        Clock that runs the game a number of times faster than real time.
+        :param factor: Speed-up, e.g. 10 waits 0.1s for every simulated second.
+        """
+        super().__init__()
+        self.factor = factor
+
+    def sleep(self, seconds):
+        self.waited += seconds
+        time.sleep(seconds / self.factor)
+
+
+class InstantClock(RealTimeClock):
+
+    def __init__(self):
+        """
+        Clock that never waits, to run games as fast as possible (e.g. in headless games).
+        """
+        super().__init__()
+
+    def sleep(self, seconds):
+        self.waited += seconds
@@ -0,0 +1,85 @@
+class DeclarativeMemory(object):
+
+    def __init__(self):
+        """
+        Ordered collection of the chunks in a model's declarative memory, indexed by chunk name.
+        """
+        self.chunks = []  # Chunks in the order they were added to DM
+        self.index = {}  # Chunk name -> Chunk, kept consistent with self.chunks
+        self.slot_index = {}  # (slot, value) -> {chunk name: Chunk}, in DM order
+        self.content_index = {}  # Chunk signature -> first Chunk in DM with exactly those slots
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def __contains__(self, chunk):
+        return self.index.get(chunk.name) is chunk
+
+    def get(self, name):
+        """
+        Find the Chunk given its name, or None if there is no such chunk
+        """
+        return self.index.get(name)
+
+    def get_by_content(self, slots):
+        """
+        Find a Chunk with exactly the specified slots and slot values, or None if there is no such chunk
+        """
+        return self.content_index.get(frozenset(slots.items()))
+
+    def add(self, chunk):
+        """
+        Add a new chunk to the end of DM
+        """
+        if chunk.name in self.index:
+            raise ValueError("A chunk named %s is already in DM" % str(chunk.name))
+        self.chunks.append(chunk)
+        self.index[chunk.name] = chunk
+        self.content_index.setdefault(chunk.signature, chunk)
+        for slot_value in chunk.slots.items():
+            self.slot_index.setdefault(slot_value, {})[chunk.name] = chunk
+
+    def remove(self, chunks):
+        """
+        Remove the specified chunks from DM, keeping the order of the remaining chunks
+        """
+        removed = set([ch.name for ch in chunks])
+        self.chunks = [ch for ch in self.chunks if ch.name not in removed]
+        for ch in chunks:
+            del self.index[ch.name]
+            for slot_value in ch.slots.items():
+                bucket = self.slot_index[slot_value]
+                del bucket[ch.name]
+                if not bucket:
+                    del self.slot_index[slot_value]
+
+        # Chunks with the same content as a removed chunk take over its content index entry
+        for ch in chunks:
+            signature = ch.signature
+            if self.content_index.get(signature) is ch:
+                del self.content_index[signature]
+                for other in self.matching(ch.slots):
+                    if other.slots == ch.slots:
+                        self.content_index[signature] = other
+                        break
+
+    def matching(self, slots):
+        """
+        Return the chunks (in DM order) that have all of the specified slot values.
+        Only the chunks in the smallest matching index bucket are checked.
+        """
+        if not slots:
+            return list(self.chunks)
+
+        buckets = []
+        for slot_value in slots.items():
+            bucket = self.slot_index.get(slot_value)
+            if bucket is None:
+                return []
+            buckets.append(bucket)
+        buckets.sort(key=len)
+
+        return [ch for name, ch in buckets[0].items() if all(name in bucket for bucket in buckets[1:])]
@@ -1,18 +1,126 @@
+import numpy as np
+
+
+def content_key(slots):
+    """
+    Canonical chunk name derived from slot contents: chunks with the same slots and slot values get the same key,
+    regardless of slot order.
+    """
+    return "{" + ", ".join(["%s: %r" % (slot, value) for slot, value in sorted(slots.items())]) + "}"
+
+
+class Encounters(object):
+    __slots__ = ('buffer', 'size')
+
+    max_tuple_size = 8  # Up to this many times are kept in a tuple, which is smaller and faster than an array
+
+    def __init__(self, times=()):
+        """
+        Store of the distinct times at which a chunk was encountered, kept in ascending order. The few encounters of
+        most chunks are kept in a tuple, which is only replaced by a numpy array when the chunk is encountered often.
+        """
+        self.buffer = ()
+        self.size = 0
+        for time in sorted(set(times)):
+            self.add(time)
+
+    @classmethod
+    def view(cls, times):
+        """
+        Wrap an array of sorted, distinct encounter times without copying it (e.g. a memory-mapped slice).
+        The array is only copied when an encounter is added.
+        """
+        encounters = cls.__new__(cls)
+        encounters.buffer = times
+        encounters.size = len(times)
+        return encounters
+
+    @property
+    def array(self):
+        """
+        The encounter times as a read-only numpy array
+        """
+        if type(self.buffer) is tuple:
+            array = np.array(self.buffer, dtype=float)
+        else:
+            array = self.buffer[:self.size]
+        array.flags.writeable = False
+        return array
+
+    def add(self, time):
+        """
+        Store an encounter at the specified time, keeping the times sorted. Duplicate times are ignored.
+        Encounters normally arrive in time order, in which case this only compares with the last time.
+        :return: Whether the encounter was stored.
+        """
+        if self.size > 0:
+            last = self.buffer[self.size - 1]
+            if time == last or (time < last and time in self):
+                return False
+
+        if type(self.buffer) is tuple:
+            if self.size < self.max_tuple_size:
+                self.buffer += (time,)
+                if self.size > 0 and time < last:
+                    self.buffer = tuple(sorted(self.buffer))
+                self.size += 1
+                return True
+            self.buffer = np.array(self.buffer, dtype=float)
+
+        if self.size == len(self.buffer):  # Grow geometrically so appends are amortised O(1)
+            buffer = np.empty(max(4, 2 * self.size))
+            buffer[:self.size] = self.buffer[:self.size]
+            self.buffer = buffer
+
+        idx = self.size
+        if idx > 0 and time < self.buffer[idx - 1]:
+            idx = int(np.searchsorted(self.buffer[:self.size], time, side='right'))
+            self.buffer[idx + 1:self.size + 1] = self.buffer[idx:self.size]
+        self.buffer[idx] = time
+        self.size += 1
+        return True
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.buffer if type(self.buffer) is tuple else self.array.tolist())
+
+    def __getitem__(self, item):
+        return self.buffer[item] if type(self.buffer) is tuple else self.array[item]
+
+    def __contains__(self, time):
+        if type(self.buffer) is tuple:
+            return time in self.buffer
+        idx = int(np.searchsorted(self.buffer[:self.size], time))
+        return idx < self.size and self.buffer[idx] == time
+
+    def __str__(self):
+        return str(list(self))
+
+
 class Chunk(object):
+    __slots__ = ('name', 'slots', 'encounters', 'fan')
 
     def __init__(self, name, slots):
         self.name = name
-        self.slots = slots
-        self.encounters = []
+        self.slots = slots  # Should not be changed after construction, since chunks are indexed by their slots
+        self.encounters = Encounters()
         self.fan = 0 # How many other chunks refer to this chunk?
 
-    
+    @property
+    def signature(self):
+        """
+        Hashable summary of the slots, derived when needed rather than stored with every chunk
+        """
+        return frozenset(self.slots.items())
+
+
     def add_encounter(self, time):
         """
         Add an encounter of this chunk at the specified time.
         """
-        if time not in self.encounters:
-            self.encounters.append(time)
+        self.encounters.add(time)
 
 
     def __str__(self):
@@ -20,4 +128,3 @@ class Chunk(object):
         "Slots: " + str(self.slots) + "\n" \
         "Encounters: " + str(self.encounters) + "\n" \
         "Fan: " + str(self.fan) + "\n"
-    
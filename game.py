@@ -1,18 +1,19 @@
-import os
-import random
-import time
 from io import StringIO
 from multiprocessing import Queue
 import copy
 
 import numpy as np
-from scipy.stats import binom
 
-from ui.invoker import *
+try:
+    from ui.invoker import *
+except ImportError:  # PySide2 is only needed when the game is shown in the UI, headless games run without it
+    invoke_in_main_thread = None
 from bid import Bid
+from clock import RealTimeClock, InstantClock
 from dmchunk import Chunk
-from model import Model
 from player import Player
+from probability import bid_probabilities
+from shared_memory import SharedMemory, AgentModel
 from communication_interface import CommunicationInterface
 
 ##############################################################
@@ -20,10 +21,6 @@ from communication_interface import CommunicationInterface
 ##############################################################
 
 
-N_PLAYERS = 4
-N_STARTING_DICE = 5
-DIFFICULTY = 1
-
 states = {
     'end': 0,
     'start': 1,
@@ -41,6 +38,11 @@ rev_states = {
     5: 'resolve_doubt'
 }
 
+difficulties = {  # difficulty of the player strategies
+    'random': 1,
+    'model': 2
+}
+
 playercolors = ['none',
                 '#CC3363',
                 '#6A80C8',
@@ -54,44 +56,54 @@ playercolors = ['none',
 ##############################################################
 
 
-def most_common(lst):
-    return max(set(lst), key=lst.count)
-
-
-def store_settings(n_players, n_starting_dice, difficulty):
-    global N_PLAYERS
-    global N_STARTING_DICE
-    global DIFFICULTY
-    N_PLAYERS = n_players
-    N_STARTING_DICE = n_starting_dice
-    DIFFICULTY = difficulty
-
-
-def determine_probability(difference, n_unknown_dice, roll_prob):
-    # determines the probability of at least n times a diceValue in m unknown dice
-
-    p = 0
-    for k in range(difference, n_unknown_dice + 1):
-        p += binom.pmf(k, n_unknown_dice, roll_prob)
-
-    return p
-
-
 class Game:
-    def __init__(self, ui_controller: CommunicationInterface, input_queue: Queue, n_players=4, n_starting_dice=5,
-                 difficulty=2,
-                 reasoning_file: StringIO = os.devnull):
+    def __init__(self, ui_controller: CommunicationInterface = None, input_queue: Queue = None, n_players=4,
+                 n_starting_dice=5, difficulty=2,
+                 reasoning_file: StringIO = None, warm_start=None, shared_memory=False, headless=False, clock=None,
+                 strategies=None, seed=None):
+        if reasoning_file is None:
+            reasoning_file = StringIO()
         self.reasoning_file = reasoning_file
         self.reasoning_file.truncate(0)
         self.reasoning_file.seek(0)
+        self.headless = headless  # all players are agents, no ui, no waiting and no printing
+        if ui_controller is None:
+            ui_controller = CommunicationInterface()  # does nothing with the calls it gets
         self.ui_controller = ui_controller
+        if clock is None:
+            clock = InstantClock() if headless else RealTimeClock()
+        self.clock = clock  # decides how long the game waits in real time
         self.input_queue = input_queue
         self.difficulty = difficulty  # difficulty 1 -> random strategy, difficulty 2 -> ACT-R model
-        self.players = [Player(n_starting_dice, self.difficulty) for _ in range(n_players)]
+        self.warm_start = warm_start  # model snapshot that the memory of model players starts from each round
+        self.strategies = strategies  # strategy per player (e.g. ['random', 'model']), instead of one difficulty
+        if shared_memory and warm_start is not None:
+            raise ValueError("Model players with a shared memory can not start from a warm start snapshot")
+        if strategies is not None and len(strategies) != n_players:
+            raise ValueError(f"Got {len(strategies)} strategies for {n_players} players")
+
+        # Every game has its own random streams, spawned from its seed: one for all dice, one for the table (first
+        # player, waits) and per player one for its policy and one for its memory noise (see Player)
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed = seed
+        dice_seed, table_seed, *player_seeds = seed.spawn(2 + n_players)
+        self.dice = np.random.default_rng(dice_seed)
+        self.rng = np.random.default_rng(table_seed)
+
+        if strategies is None:
+            player_difficulties = [self.difficulty] * n_players
+        else:
+            player_difficulties = [difficulties[strategy] for strategy in strategies]
+        self.players = [Player(n_starting_dice, player_difficulty, warm_start, seed=player_seed, dice=self.dice)
+                        for player_difficulty, player_seed in zip(player_difficulties, player_seeds)]
+        self.shared_memory = shared_memory  # keep all model players' memory in one SharedMemory
+        self.memory = None
         self.n_players = n_players
+        self.n_starting_dice = n_starting_dice
         self.n_total_dice = n_players * n_starting_dice
         self.current_bid = Bid(1, 0)
-        self.turn = random.randint(0, n_players - 1)
+        self.turn = int(self.rng.integers(0, n_players))
         self.current_player = self.turn
         self.previous_player = 0
         self.round = 1
@@ -99,53 +111,89 @@ class Game:
 
         # First player is chosen at random
         # Turns happen by iterating circularly the players list
-        self.player_ID = 0
-        self.players[0].strategy = 'human'
+        if self.headless:
+            self.player_ID = None
+        else:
+            self.player_ID = 0
+            self.players[0].strategy = 'human'
 
         self.chunk_retrieval_count = 0
         self.chunk_retrieval_failure_count = 0
 
         self.model_bluff_chance = 33
 
-        store_settings(n_players, n_starting_dice, difficulty)
 
 
     ####################################################################################################
     #############################             HELPER FUNCTIONS (CLASS)               ###################
     ####################################################################################################
 
+    def invoke(self, fn, *args, **kwargs):
+        # Call a ui controller method in the ui's main thread, unless the game is headless
+        if not self.headless:
+            invoke_in_main_thread(fn, *args, **kwargs)
+
+    def sleep(self, seconds):
+        # Wait for the ui (e.g. dice rolling), as long as the clock says
+        self.clock.sleep(seconds)
+
+    def think(self, seconds):
+        # An agent 'thinking': the model time increases with the simulated thinking time, independent of how long the
+        # clock actually waits
+        self.clock.sleep(seconds)
+        self.increase_models_time(seconds)
+
+    def log(self, *args, **kwargs):
+        if not self.headless:
+            print(*args, **kwargs)
+
     def reset_models(self):
+        if self.shared_memory:
+            self.memory = SharedMemory(self.n_players)
         for idx in range(self.n_players):
             if self.players[idx].strategy == 'model':
-                self.players[idx].model = Model()
+                if self.memory is not None:
+                    self.players[idx].model = AgentModel(self.memory, idx,
+                                                         seed=self.players[idx].memory_seed.spawn(1)[0])
+                else:
+                    self.players[idx].model = self.players[idx].new_model()
 
     def increase_models_time(self, t):
+        if self.memory is not None:  # all models share one clock
+            self.memory.time += t
+            return
         for idx in range(self.n_players):
             if self.players[idx].strategy == 'model':
                 self.players[idx].model.time += t
 
     def reset(self):
-        self.__init__(self.ui_controller, self.input_queue, N_PLAYERS, N_STARTING_DICE, DIFFICULTY)
+        self.__init__(self.ui_controller, self.input_queue, self.n_players, self.n_starting_dice, self.difficulty,
+                      reasoning_file=self.reasoning_file, warm_start=self.warm_start,
+                      shared_memory=self.shared_memory, headless=self.headless, clock=self.clock,
+                      strategies=self.strategies, seed=self.seed.spawn(1)[0])
 
     def all_roll(self):
-        for p in self.players:
-            p.roll_hand()
+        # All dice on the table are drawn at once, in the same order as rolling the players' hands one by one
+        n_dice = [p.n_dice for p in self.players]
+        dice = self.dice.integers(1, 7, size=sum(n_dice))
+        for p, hand in zip(self.players, np.split(dice, np.cumsum(n_dice)[:-1])):
+            p.set_hand(hand)
         for idx, p in enumerate(self.players):
             if idx != self.player_ID:
-                invoke_in_main_thread(self.ui_controller.display_action_enemy, enemy_nr=idx,
-                                      action=3)
-            invoke_in_main_thread(self.ui_controller.display_dice, player_nr=idx,
-                                  dice=p.get_hand_size(),
-                                  state=1)
-        invoke_in_main_thread(self.ui_controller.show_info, string="All players are rolling dice.")
+                self.invoke(self.ui_controller.display_action_enemy, enemy_nr=idx,
+                            action=3)
+            self.invoke(self.ui_controller.display_dice, player_nr=idx,
+                        dice=p.get_hand_size(),
+                        state=1)
+        self.invoke(self.ui_controller.show_info, string="All players are rolling dice.")
 
         # Sleep for 2 seconds, animation will play
-        time.sleep(random.uniform(2.5, 3.5))  # agent 'rolling dice'
+        self.sleep(self.rng.uniform(2.5, 3.5))  # agent 'rolling dice'
 
         for idx, p in enumerate(self.players):
             if idx != self.player_ID:
-                invoke_in_main_thread(self.ui_controller.display_action_enemy, enemy_nr=idx,
-                                      action=2)
+                self.invoke(self.ui_controller.display_action_enemy, enemy_nr=idx,
+                            action=2)
 
     def update_turn_generic(self):  # sets turn to the next player
         self.turn = (self.turn + 1) % self.n_players
@@ -181,66 +229,58 @@ class Game:
 
         return doubt
 
-    def determine_model_doubt(self, player_index):
+    def determine_models_doubt(self, player_indices):
         '''
-        Determines whether the model believes a bid, on the basis of probability calculations and some randomness
-        :param player_index:
-        :return: doubt (true or false)
+        Determines for several models at once whether they believe the current bid (see determine_model_doubt). The
+        probability of the bid is read for all models at once from their bid probability tables (see
+        bid_probabilities), each model draws its believe threshold from its own random stream.
+        :param player_indices: indices of the model players, in the order in which they decide
+        :return: list of (doubt, probability of bid, believe threshold) per player, probability and threshold are None
+        when the bid count is already in the model's cup
         '''
-        n_unknown_dice = self.n_total_dice - len(
-            self.players[player_index].hand)  # determine number of unknown dice
-        if self.current_bid.roll != 1:  # bid is on a non-joker dice
-
-            dice_count = self.players[player_index].hand.count(
-                self.current_bid.roll)  # counts instances of the value of the dice in the bid
-            dice_count += self.players[player_index].hand.count(1)  # add joker dice to count
-
-            if dice_count >= self.current_bid.count:  # the number of dice is already in the models cup
-                # print('[DEBUG] Bid count present in Models cup')
-                doubt = False
+        bid_count, bid_roll = self.current_bid.count, self.current_bid.roll
+        if not player_indices:
+            return []
+
+        tables = np.stack([bid_probabilities(self.players[idx].counts, self.n_total_dice) for idx in player_indices])
+        probabilities = tables[:, bid_roll, min(bid_count, self.n_total_dice + 1)]  # probability that the bid is on
+        # the table, given each model's hand (jokers also add to the total of non-joker values)
+
+        decisions = []
+        for idx, probability_of_bid in zip(player_indices, probabilities):
+            dice_count = self.players[idx].get_roll_count(bid_roll, jokers=True)  # counts instances of the value of
+            # the dice in the bid, joker dice included if the bid is on a non-joker dice
+            if dice_count >= bid_count:  # the number of dice is already in the models cup
+                decisions.append((False, None, None))
             else:
-                difference = self.current_bid.count - dice_count
-                probability_of_bid = determine_probability(difference, n_unknown_dice,
-                                                           1 / 3)  # probability that at least the difference of a
-                # given value is in the unknown dice, 1/3 prob since joker dice also add to total
-                believe_threshold = np.random.normal(1 / 4, 1 / 12,
-                                                     1)  # compare probability to non-static threshold,
-                # TODO: think about how to set the threshold, this could be another difficulty -> more random threshold
+                believe_threshold = self.players[idx].rng.normal(1 / 4, 1 / 12)  # compare probability to
+                # non-static threshold, TODO: think about how to set the threshold, this could be another difficulty ->
+                # more random threshold
+                decisions.append((probability_of_bid < believe_threshold, probability_of_bid, believe_threshold))
+        return decisions
 
-                self.reasoning_file.write(
-                    f"<p class='t{player_index}'>Determining probability of {self.current_bid.count} x {self.current_bid.roll} and comparing to believe threshold:</p>")
-                self.reasoning_file.write(
-                    f"<p class='t{player_index}'>Probability of bid is {round(probability_of_bid, 3)}, believe threshold is {round(believe_threshold[0], 3)}</p>")
-
-                if probability_of_bid >= believe_threshold[0]:
-                    doubt = False
-                else:
-                    doubt = True
-
-        else:  # bid is on joker dice
-            dice_count = self.players[player_index].hand.count(
-                self.current_bid.roll)  # counts instances of the value of the dice in the bid (only joker dice)
-
-            if dice_count >= self.current_bid.count:  # the number of dice is already in the model's cup
-                doubt = False
-            else:
-                difference = self.current_bid.count - dice_count
-                probability_of_bid = determine_probability(difference, n_unknown_dice,
-                                                           1 / 6)  # probability that at least the difference of
-                # joker dice is in the unknown dice, prob = 1/6
-                believe_threshold = np.random.normal(1 / 4, 1 / 12,
-                                                     1)  # compare probability to non-static threshold,
-                # TODO: think about how to set the threshold, this could be another difficulty -> more random threshold
-                self.reasoning_file.write(
-                    f"<p class='t{player_index}'>Determining probability of {self.current_bid.count} x {self.current_bid.roll} and comparing to believe threshold:</p>")
-                self.reasoning_file.write(
-                    f"<p class='t{player_index}'>Probability of bid is {round(probability_of_bid, 3)}, believe threshold is {round(believe_threshold[0], 3)}</p>")
+    def get_bid_probability(self, player_index, count, roll):
+        """
+        The probability that a bid of count x roll is on the table, given the hand of a player (see bid_probabilities)
+        """
+        probabilities = bid_probabilities(self.players[player_index].counts, self.n_total_dice)
+        return probabilities[roll, min(count, self.n_total_dice + 1)]
 
-                if probability_of_bid >= believe_threshold[0]:
-                    doubt = False
-                else:
-                    doubt = True
+    def write_model_doubt_reasoning(self, player_index, probability_of_bid, believe_threshold):
+        self.reasoning_file.write(
+            f"<p class='t{player_index}'>Determining probability of {self.current_bid.count} x {self.current_bid.roll} and comparing to believe threshold:</p>")
+        self.reasoning_file.write(
+            f"<p class='t{player_index}'>Probability of bid is {round(probability_of_bid, 3)}, believe threshold is {round(believe_threshold, 3)}</p>")
 
+    def determine_model_doubt(self, player_index):
+        '''
+        Determines whether the model believes a bid, on the basis of probability calculations and some randomness
+        :param player_index:
+        :return: doubt (true or false)
+        '''
+        doubt, probability_of_bid, believe_threshold = self.determine_models_doubt([player_index])[0]
+        if probability_of_bid is not None:
+            self.write_model_doubt_reasoning(player_index, probability_of_bid, believe_threshold)
         return doubt
 
     def model_doubt(self):
@@ -250,15 +290,15 @@ class Game:
         :return: Boolean whether the model decides it should call a bluff.
         """
         doubt = False
+        rng = self.players[self.current_player].rng
 
         # ------------------------------------Determine random (not) believe--------------------------------------- #
         if self.players[self.current_player].strategy == 'random':
-            y = random.uniform(2.5, 4)
-            time.sleep(y)  # agent 'thinking'
-            self.increase_models_time(y)  # increase the model time with thinking time
+            y = rng.uniform(2.5, 4)
+            self.think(y)  # agent 'thinking', increases the model time with thinking time
 
             believe_percentage = 0.8
-            if random.randint(1, 1000) <= 1000 * believe_percentage:
+            if rng.integers(1, 1001) <= 1000 * believe_percentage:
                 doubt = False  # Placeholder
                 self.reasoning_file.write(f"<p class='t{self.current_player}'>I believe the bid (80% probability)</p>")
             else:
@@ -270,14 +310,13 @@ class Game:
         elif self.players[self.current_player].strategy == 'model':
 
             x = len(self.players[self.current_player].model.dm)  # counts number of chunks in memory
-            y = random.uniform(1, 1.5)
+            y = rng.uniform(1, 1.5)
             if x != 0:
                 y += np.log(x * 2)
             if y < 2.5:
                 y = 2.5
-            print(f'Number of chunks in memory = {x}, Waiting time = {round(y, 2)}s ')
-            time.sleep(y)  # agent 'thinking'
-            self.increase_models_time(y)  # increase the model time with thinking time
+            self.log(f'Number of chunks in memory = {x}, Waiting time = {round(y, 2)}s ')
+            self.think(y)  # agent 'thinking', increases the model time with thinking time
 
             doubt = self.determine_model_doubt(self.current_player)
             if doubt:
@@ -294,25 +333,25 @@ class Game:
         Calls for the ui and ask the player if it should call a bluff
         :return: Boolean whether the player decides it should call a bluff.
         """
-        y = random.uniform(2.5, 4)
+        y = self.players[self.current_player].rng.uniform(2.5, 4)
         self.increase_models_time(y)  # increase model time with approx human 'thinking' time
 
-        invoke_in_main_thread(fn=self.ui_controller.set_bluff_controls_enabled, enabled=True,
-                              target=self.previous_player)
+        self.invoke(fn=self.ui_controller.set_bluff_controls_enabled, enabled=True,
+                    target=self.previous_player)
 
-        print(f"Do you want to doubt and call {self.current_bid.count} x {self.current_bid.roll} a lie? 1=yes, 0=no: ")
+        self.log(f"Do you want to doubt and call {self.current_bid.count} x {self.current_bid.roll} a lie? 1=yes, 0=no: ")
         doubt = int(self.input_queue.get(block=True))
         if doubt == -1:
             quit(0)
 
         while doubt != 0 and doubt != 1:
-            print(
+            self.log(
                 f"(Try again) Do you want to doubt and call {self.current_bid.count} x {self.current_bid.roll} a lie? "
                 f"1=yes, 0=no: ")
             doubt = int(self.input_queue.get(block=True))
             if doubt == -1:
                 quit(0)
-        invoke_in_main_thread(fn=self.ui_controller.set_bluff_controls_enabled, enabled=False)
+        self.invoke(fn=self.ui_controller.set_bluff_controls_enabled, enabled=False)
 
         return doubt
 
@@ -329,56 +368,60 @@ class Game:
         count = 0
         lose_dice_players = []  # save such that players dice are gone after hands are shown
 
-        print('[RESOLVING DOUBT] Every remaining player has to state whether they believe the bid or not')
-        invoke_in_main_thread(self.ui_controller.show_info, string=f"Resolving doubt.")
+        self.log('[RESOLVING DOUBT] Every remaining player has to state whether they believe the bid or not')
+        self.invoke(self.ui_controller.show_info, string=f"Resolving doubt.")
         handstring = ''
         for idx in range(self.n_players):
-            count += self.players[idx].get_roll_count(bid_roll)
-
-            if bid_roll != 1:  # joker dice addition, given that this wasn't the value bid on.
-                count += self.players[idx].get_roll_count(1)
+            count += self.players[idx].get_roll_count(bid_roll, jokers=True)  # joker dice addition, given that
+            # this wasn't the value bid on.
 
             handstring += f'Player {idx}: {self.players[idx].hand} '
 
-        # Ask all players whether they believe the bid, remove their dice accordingly
-        for player in range(self.n_players):
+        # this makes sure the players are asked in the correct order (starting from the first player after the doubting)
+        resolve_order = [(self.current_player + self.n_players + player) % self.n_players
+                         for player in range(self.n_players)]
+        resolving_models = [idx for idx in resolve_order
+                            if idx != self.current_player and idx != self.previous_player
+                            and self.players[idx].strategy == 'model']
+        model_decisions = dict(zip(resolving_models, self.determine_models_doubt(resolving_models)))
 
-            idx = (self.current_player + self.n_players + player) % self.n_players
-            # this makes sure the players are asked in the correct order (starting from the first player after the doubting)
+        # Ask all players whether they believe the bid, remove their dice accordingly
+        for idx in resolve_order:
 
             if idx != self.current_player and idx != self.previous_player:  # only apply to other players than
                 # current and previous turn
                 if idx != self.player_ID:
-                    invoke_in_main_thread(self.ui_controller.show_info, string=f"Resolving doubt: Player {idx}'s turn.")
+                    self.invoke(self.ui_controller.show_info, string=f"Resolving doubt: Player {idx}'s turn.")
                 else:
-                    invoke_in_main_thread(self.ui_controller.show_info, string=f"Resolving doubt: Your turn.")
+                    self.invoke(self.ui_controller.show_info, string=f"Resolving doubt: Your turn.")
 
                 believe = ""
+                rng = self.players[idx].rng
 
                 # ------------------------------------Human resolve doubt--------------------------------------- #
                 if self.players[idx].strategy == 'human':
-                    y = random.uniform(2.5, 4)
+                    y = rng.uniform(2.5, 4)
                     self.increase_models_time(y)  # increase model time with approx human 'thinking' time
 
-                    invoke_in_main_thread(self.ui_controller.set_bluff_controls_enabled, enabled=True,
-                                          target=self.previous_player)
-                    invoke_in_main_thread(self.ui_controller.display_dice, player_nr=self.player_ID,
-                                          dice=self.players[0].hand)
-                    print(f"Your hand is {self.players[idx].hand}. Do you believe {bid_count} x {bid_roll} is on the "
-                          f"table? 1=yes, 0=no: ")
+                    self.invoke(self.ui_controller.set_bluff_controls_enabled, enabled=True,
+                                target=self.previous_player)
+                    self.invoke(self.ui_controller.display_dice, player_nr=self.player_ID,
+                                dice=self.players[0].hand)
+                    self.log(f"Your hand is {self.players[idx].hand}. Do you believe {bid_count} x {bid_roll} is on the "
+                             f"table? 1=yes, 0=no: ")
                     believe_ui = int(self.input_queue.get(block=True))
                     believe = believe_ui == 0
 
                     if believe == -1:
                         quit(0)
                     while believe != 0 and believe != 1:
-                        print(
+                        self.log(
                             f'(Try again) Your hand is {self.players[idx].hand}. Do you believe {bid_count} x {bid_roll}'
                             f' is on the table? 1=yes, 0=no: ')
                         believe = int(self.input_queue.get(block=True))
                         if believe == -1:
                             quit(0)
-                    invoke_in_main_thread(self.ui_controller.set_bluff_controls_enabled, enabled=False)
+                    self.invoke(self.ui_controller.set_bluff_controls_enabled, enabled=False)
                     if believe == 1:
                         self.reasoning_file.write(f"<p'>You believe the bid</p>")
                     else:
@@ -387,11 +430,10 @@ class Game:
 
                 # ------------------------------------Random resolve doubt--------------------------------------- #
                 elif self.players[idx].strategy == 'random':
-                    y = random.uniform(2.5, 4)
-                    time.sleep(y)  # agent 'thinking'
-                    self.increase_models_time(y)  # increase the model time with thinking time
+                    y = rng.uniform(2.5, 4)
+                    self.think(y)  # agent 'thinking', increases the model time with thinking time
 
-                    if random.randint(1, 100) >= 50:
+                    if rng.integers(1, 101) >= 50:
                         believe = True
                         self.reasoning_file.write(
                             f"<p class='t{idx}'>I believe the bid (50% probability in resolve)</p>")
@@ -404,16 +446,19 @@ class Game:
                 # ------------------------------------Model resolve doubt--------------------------------------- #
                 elif self.players[idx].strategy == 'model':
                     x = len(self.players[idx].model.dm)  # counts number of chunks in memory
-                    y = random.uniform(1, 1.5)
+                    y = rng.uniform(1, 1.5)
                     if x != 0:
                         y += np.log(x * 2)
                     if y < 2.5:
                         y = 2.5
-                    print(f'Number of chunks in memory = {x}, Waiting time = {round(y, 2)}s ')
-                    time.sleep(y)  # agent 'thinking'
-                    self.increase_models_time(y)  # increase the model time with thinking time
+                    self.log(f'Number of chunks in memory = {x}, Waiting time = {round(y, 2)}s ')
+                    self.think(y)  # agent 'thinking', increases the model time with thinking time
+
+                    doubt, probability_of_bid, believe_threshold = model_decisions[idx]
+                    if probability_of_bid is not None:
+                        self.write_model_doubt_reasoning(idx, probability_of_bid, believe_threshold)
 
-                    if self.determine_model_doubt(idx):
+                    if doubt:
                         believe = False  # if doubt is true -> believe = False (and vice versa)
                         self.reasoning_file.write(
                             f"<p class='t{idx}'>I do not believe the bid</p>")
@@ -423,43 +468,43 @@ class Game:
                             f"<p class='t{idx}'>I believe the bid</p>")
 
                 if believe:
-                    invoke_in_main_thread(fn=self.ui_controller.display_action_enemy,
-                                          enemy_nr=idx,
-                                          action=4,
-                                          target=self.previous_player)
-                    print(f'Player {idx} believes the bid is on the table')
+                    self.invoke(fn=self.ui_controller.display_action_enemy,
+                                enemy_nr=idx,
+                                action=4,
+                                target=self.previous_player)
+                    self.log(f'Player {idx} believes the bid is on the table')
                     if count >= bid_count:  # lose a die when the bid is believed and true, or not believe and false
                         lose_dice_players.append(idx)
                         # self.players[idx].remove_die()
 
                 else:
-                    invoke_in_main_thread(fn=self.ui_controller.display_action_enemy,
-                                          enemy_nr=idx,
-                                          action=1,
-                                          target=self.previous_player)
-                    print(f'Player {idx} does not believe the bid is on the table')
+                    self.invoke(fn=self.ui_controller.display_action_enemy,
+                                enemy_nr=idx,
+                                action=1,
+                                target=self.previous_player)
+                    self.log(f'Player {idx} does not believe the bid is on the table')
                     if count < bid_count:
                         lose_dice_players.append(idx)
                         # self.players[idx].remove_die()
 
-        print('Players hands are opened: ', end='')
-        print(handstring)
+        self.log('Players hands are opened: ', end='')
+        self.log(handstring)
 
         # -------------------------------Reveal all dice, determine who is correct---------------------------------- #
         # Reveal all dice in ui and wait for a bit
 
         for idx, player in enumerate(self.players):
-            invoke_in_main_thread(self.ui_controller.display_dice, player_nr=idx, dice=player.hand,
-                                  highlight=bid_roll)
-            time.sleep(0.1 * len(player.hand))
+            self.invoke(self.ui_controller.display_dice, player_nr=idx, dice=player.hand,
+                        highlight=bid_roll)
+            self.sleep(0.1 * len(player.hand))
 
-        print(f'The bid was {bid_count} x {bid_roll}. On the table in total, there was {count} x {bid_roll}')
-        invoke_in_main_thread(self.ui_controller.show_info,
-                              string=f"The bid was: {bid_count} x {bid_roll}.<br>"
+        self.log(f'The bid was {bid_count} x {bid_roll}. On the table in total, there was {count} x {bid_roll}')
+        self.invoke(self.ui_controller.show_info,
+                    string=f"The bid was: {bid_count} x {bid_roll}.<br>"
                                      f"On the table: {count} x {bid_roll}.")
 
         timeout_time = 0.2 * self.n_total_dice  # Lower this to make it faster
-        time.sleep(timeout_time)
+        self.sleep(timeout_time)
         # self.wait_for_continue(timeout_time)
 
         if count >= bid_count:  #
@@ -475,12 +520,12 @@ class Game:
         # This part handles which players lose a die and what is printed / shown in the UI
         if len(lose_dice_players) <= 1:
             if lose_dice_players[0] == 0:
-                invoke_in_main_thread(self.ui_controller.show_info,
-                                      string=f"You were correct.<br>"
+                self.invoke(self.ui_controller.show_info,
+                            string=f"You were correct.<br>"
                                              f"You lose a die.")
             else:
-                invoke_in_main_thread(self.ui_controller.show_info,
-                                      string=f"Player {', '.join(map(str, lose_dice_players))} was correct.<br>"
+                self.invoke(self.ui_controller.show_info,
+                            string=f"Player {', '.join(map(str, lose_dice_players))} was correct.<br>"
                                              f"Player {', '.join(map(str, lose_dice_players))} will lose a die.")
         else:
             lose_dice_players.sort()
@@ -488,33 +533,33 @@ class Game:
                 temp_lose_dice_players = copy.deepcopy(lose_dice_players)
                 temp_lose_dice_players.pop(0)
 
-                invoke_in_main_thread(self.ui_controller.show_info,
-                                      string=f"{'Player' if len(temp_lose_dice_players) == 1 else 'Players'} {', '.join(map(str, temp_lose_dice_players))} and you were correct. <br>"
+                self.invoke(self.ui_controller.show_info,
+                            string=f"{'Player' if len(temp_lose_dice_players) == 1 else 'Players'} {', '.join(map(str, temp_lose_dice_players))} and you were correct. <br>"
                                              f"{'Player' if len(temp_lose_dice_players) == 1 else 'Players'} {', '.join(map(str, temp_lose_dice_players))} and you will lose a die.")
             else:
-                invoke_in_main_thread(self.ui_controller.show_info,
-                                      string=f"Players {', '.join(map(str, lose_dice_players))} were correct.<br>"
+                self.invoke(self.ui_controller.show_info,
+                            string=f"Players {', '.join(map(str, lose_dice_players))} were correct.<br>"
                                              f" They will lose a die.")
 
         for idx in range(self.n_players):
-            invoke_in_main_thread(self.ui_controller.display_dice, player_nr=idx,
-                                  dice=self.players[idx].get_hand_size(),
-                                  state=2 if idx in lose_dice_players else 0)
+            self.invoke(self.ui_controller.display_dice, player_nr=idx,
+                        dice=self.players[idx].get_hand_size(),
+                        state=2 if idx in lose_dice_players else 0)
 
         for i in lose_dice_players:
             self.players[i].remove_die()
 
-        time.sleep(4)
+        self.sleep(4)
 
-        # print('[INFO] Number of dice remaining per player: ', end='')
+        # self.log('[INFO] Number of dice remaining per player: ', end='')
         # for idx in range(self.n_players):
-        #     print(f' Player {idx}: {self.players[idx].get_hand_size()}  ||  ', end='')
+        #     self.log(f' Player {idx}: {self.players[idx].get_hand_size()}  ||  ', end='')
         #     if idx != self.player_ID:
-        #         invoke_in_main_thread(self.ui_controller.display_dice, player_nr=idx,
+        #         self.invoke(self.ui_controller.display_dice, player_nr=idx,
         #                               dice=self.players[idx].get_hand_size(),
         #                               state=0)
 
-        print()
+        self.log()
 
     #########################################################################################################
     ###########################                    BIDDING PHASE                  ###########################
@@ -522,26 +567,21 @@ class Game:
 
     def models_remember_bid(self):
         # Making and storing chunks of bids for ACT-R models
-        for i in range(self.n_players):
-            if i != self.current_player and self.players[i].strategy == 'model':
+        bid_memory = {"type": "bid_memory",
+                      "player": self.current_player,
+                      "dice_value": self.current_bid.roll}  # remember the value a player has bid on
+        listeners = [i for i in range(self.n_players)
+                     if i != self.current_player and self.players[i].strategy == 'model']
 
-                added = False
-                number = 0
+        if self.memory is not None:  # one encounter for all listening models
+            self.memory.add_encounter_by_content(bid_memory, listeners)
 
-                while not added:  # This loop handles potential chunk naming problems
-                    try:
-                        ch = Chunk(name="bid_memory" + str(number),
-                                   slots={"type": "bid_memory",
-                                          "player": self.current_player,
-                                          "dice_value": self.current_bid.roll})  # remember the value a player has bid on
-                        self.players[i].model.add_encounter(ch)  # remember the bid of a player
+        for i in listeners:
+            if self.memory is None:
+                self.players[i].model.add_encounter_by_content(bid_memory)
 
-                        added = True
-                    except ValueError:
-                        number += 1
-
-                self.reasoning_file.write(
-                    f"<p class='t{i}'>Storing chunk to remember that Player {self.current_player} has made a bid on dice value {self.current_bid.roll}</p>")
+            self.reasoning_file.write(
+                f"<p class='t{i}'>Storing chunk to remember that Player {self.current_player} has made a bid on dice value {self.current_bid.roll}</p>")
 
     def bidding(self):
         """
@@ -549,13 +589,13 @@ class Game:
         Redirection to model for opponents and GUI for human player.
         """
         if self.current_player == self.player_ID:
-            self.increase_models_time(random.uniform(2.5,
-                                                     4))  # increasing model times with a random, since human players might take very long or short to affect models
+            self.increase_models_time(self.players[self.current_player].rng.uniform(2.5,
+                                                                                    4))  # increasing model times with a random, since human players might take very long or short to affect models
             count, roll = self.ui_bid()
             self.reasoning_file.write(f"<p>You have bid {count} x {roll}</p>")
         else:
-            invoke_in_main_thread(self.ui_controller.display_action_enemy, enemy_nr=self.current_player,
-                                  action=0)
+            self.invoke(self.ui_controller.display_action_enemy, enemy_nr=self.current_player,
+                        action=0)
             count, roll = self.model_bid()
             if self.players[self.current_player].strategy == 'model' or self.players[
                 self.current_player].strategy == 'random':
@@ -608,31 +648,31 @@ class Game:
         """
 
         higher = False
-        invoke_in_main_thread(self.ui_controller.set_bet_controls_enabled, enabled=True,
-                              previous_bet=f"{self.current_bid.count} × {self.current_bid.roll}")
+        self.invoke(self.ui_controller.set_bet_controls_enabled, enabled=True,
+                    previous_bet=f"{self.current_bid.count} × {self.current_bid.roll}")
 
         count, roll = 0, 0
-        invoke_in_main_thread(self.ui_controller.set_bet_limits, number_min=0, number_max=self.n_total_dice, dice_min=1,
-                              dice_max=6)
+        self.invoke(self.ui_controller.set_bet_limits, number_min=0, number_max=self.n_total_dice, dice_min=1,
+                    dice_max=6)
 
         while not higher:  # Random bid, on a higher count with random dice value
-            print("[BID] Number of dice: ")  # Placeholder
+            self.log("[BID] Number of dice: ")  # Placeholder
             count = int(self.input_queue.get(block=True))
             if count == -1:
                 quit(0)
-            print("[BID] Value of those dice: ")  # Placeholder
+            self.log("[BID] Value of those dice: ")  # Placeholder
             roll = int(self.input_queue.get(block=True))
             if roll == -1:
                 quit(0)
             if count > 0 and 1 <= roll <= 6 and self.is_higher_bid(count, roll):
                 higher = True
             else:
-                print('Bid impossible or not high enough, try again!')
-                invoke_in_main_thread(self.ui_controller.show_info, string=
+                self.log('Bid impossible or not high enough, try again!')
+                self.invoke(self.ui_controller.show_info, string=
                 f"<b style='color:#FF0000'>You need to overbid {self.current_bid.count} × {self.current_bid.roll}!</b><br>"
                 f"See Help > How to Play for rules.")
-        invoke_in_main_thread(self.ui_controller.set_bet_controls_enabled, enabled=False,
-                              previous_bet=f"{self.current_bid.count} × {self.current_bid.roll}")
+        self.invoke(self.ui_controller.set_bet_controls_enabled, enabled=False,
+                    previous_bet=f"{self.current_bid.count} × {self.current_bid.roll}")
 
         return count, roll
 
@@ -644,21 +684,22 @@ class Game:
         """
 
         count, roll = 0, 0
+        rng = self.players[self.current_player].rng
 
         # -----------------------------------------Random bidding-------------------------------------------- #
         if self.players[self.current_player].strategy == 'random':
 
             if self.current_bid.roll == 1:
-                if random.randint(1, 1000) <= 167:  # random chance to bid on 1's
+                if rng.integers(1, 1001) <= 167:  # random chance to bid on 1's
                     roll = 1
                     count = self.current_bid.count + 1
                 else:
                     count = self.current_bid.count * 2  # first non-joker bid over a joker bid must be double the count
-                    roll = random.randint(2, 6)
+                    roll = int(rng.integers(2, 7))
 
             else:  # current bid is not on joker dice
 
-                if random.randint(1, 1000) <= 167:  # random chance to bid on 1's
+                if rng.integers(1, 1001) <= 167:  # random chance to bid on 1's
                     if self.current_bid.count % 2 == 1:
                         count = int((self.current_bid.count + 1) / 2)  # joker bid must be double the count
                     else:
@@ -669,20 +710,20 @@ class Game:
                     higher = False
                     while not higher:  # Random bid, on a higher count with random dice value
                         count = self.current_bid.count
-                        roll = random.randint(2, 6)
+                        roll = int(rng.integers(2, 7))
 
                         if count > self.current_bid.count or (
                                 count == self.current_bid.count and roll > self.current_bid.roll):
                             higher = True
                         else:
                             count = self.current_bid.count + 1
-                            roll = random.randint(2, 6)
+                            roll = int(rng.integers(2, 7))
                             higher = True
 
         # -----------------------------------------Model bidding-------------------------------------------- #
         elif self.players[self.current_player].strategy == 'model':
-            if random.randint(1, 100) <= self.model_bluff_chance:  # chance to bluff
-                if random.randint(1, 100) >= 66:  # determine which player the model will bluff on, next player has a
+            if rng.integers(1, 101) <= self.model_bluff_chance:  # chance to bluff
+                if rng.integers(1, 101) >= 66:  # determine which player the model will bluff on, next player has a
                     # higher chance, since he has to assess the bid.
                     bluff_player = self.previous_player
                     self.reasoning_file.write(
@@ -692,14 +733,16 @@ class Game:
                     self.reasoning_file.write(
                         f"<p class='t{self.current_player}'>Aiming to bluff on one of the dice values bid on by next player</p>")
 
-                chunk = None
-                tries = 0
-                while chunk is None and tries < self.n_players - 1:  # model has a number of tries to remember the bet of a player according to the number of players, otherwise models remember too little with the increased time
-                    retrieve_chunk = Chunk(name="memorize_bid_value",
-                                           slots={"type": "bid_memory", "player": bluff_player})
-                    chunk, latency = self.players[self.current_player].model.retrieve(
-                        retrieve_chunk)  # retrieve a chunk from declarative memory
-                    tries += 1
+                retrieve_chunk = Chunk(name="memorize_bid_value",
+                                       slots={"type": "bid_memory", "player": bluff_player})
+                retrievals = self.players[self.current_player].model.retrieve_many(
+                    [retrieve_chunk] * (self.n_players - 1))  # model has a number of tries to remember the bet of a player according to the number of players, otherwise models remember too little with the increased time
+                chunk, retrieval_time = None, 0
+                for chunk, latency in retrievals:  # the tries are made one after the other, until one succeeds
+                    retrieval_time += latency
+                    if chunk is not None:
+                        break
+                self.think(retrieval_time)  # the model time increases with the retrieval latencies
                 self.reasoning_file.write(
                     f"<p class='t{self.current_player}'>Trying to memorize a chunk containing a value Player {bluff_player} has bid on</p>")
 
@@ -713,7 +756,7 @@ class Game:
                         f"<p class='t{self.current_player}'>Bluffing on {roll}, since Player {bluff_player} has bid on {roll} before</p>")
 
                 else:  # no chunk was retrieved / retrieval failure
-                    # print('\nChunk retrieval failed')
+                    # self.log('\nChunk retrieval failed')
                     self.chunk_retrieval_failure_count += 1
 
                     self.reasoning_file.write(
@@ -721,8 +764,8 @@ class Game:
                     self.reasoning_file.write(
                         f"<p class='t{self.current_player}'>Can not remember a value Player {bluff_player} has bid on before, bluffing on random value</p>")
 
-                    # print('[DEBUG] no chunk was retrieved / retrieval failure')
-                    roll = random.randint(1, 6)  # bluffing happens on a random die value
+                    # self.log('[DEBUG] no chunk was retrieved / retrieval failure')
+                    roll = int(rng.integers(1, 7))  # bluffing happens on a random die value
 
                 if roll == 1:  # bluff will be on joker dice
 
@@ -750,17 +793,10 @@ class Game:
                             count = self.current_bid.count + 1  # else: increment count, and bid on the value
 
             else:  # model will not bluff -> determine a bid from hand
-                most_com_value = most_common(self.players[self.current_player].hand)
-                n_of_most = self.players[self.current_player].hand.count(most_com_value)
-
-                highest_value = [self.players[self.current_player].hand[m] for m in
-                                 range(len(self.players[self.current_player].hand))
-                                 if self.players[self.current_player].hand.count(
-                        self.players[self.current_player].hand[m]) == n_of_most]
+                highest_value, n_of_most = self.players[self.current_player].get_most_common()
 
-                bid_value = highest_value[random.randint(0, len(
-                    highest_value) - 1)]  # determine most common value in hand and choose one of those values from
-                # hand (if multiple, chooses randomly)
+                bid_value = highest_value[rng.integers(len(highest_value))]  # determine most common value in hand and
+                # choose one of those values from hand (if multiple, chooses randomly)
 
                 roll = bid_value
 
@@ -796,15 +832,15 @@ class Game:
     def clear_ui_bets(self):
         for idx, player in enumerate(self.players):  # Counts dice, which also determines winner
             if idx != self.player_ID:
-                invoke_in_main_thread(self.ui_controller.display_bet_enemy, enemy_nr=idx,
-                                      number="", dice=0)
+                self.invoke(self.ui_controller.display_bet_enemy, enemy_nr=idx,
+                            number="", dice=0)
 
     def wait_for_continue(self, timeout_time: float):
         """
         Wait for the player to continue, after a doubt has been resolved
         :return: once the player has given some input, or a timeout expires
         """
-        invoke_in_main_thread(self.ui_controller.set_continue_controls_enabled, enabled=True)
+        self.invoke(self.ui_controller.set_continue_controls_enabled, enabled=True)
         loader_step = 5  # How much% the loader should move each tick
         # Wait for the player to click to continue
         import queue  # to recognize the exception
@@ -816,9 +852,9 @@ class Game:
                     quit(0)
                 break
             except queue.Empty:
-                invoke_in_main_thread(self.ui_controller.set_continue_timeout_progress, i)
+                self.invoke(self.ui_controller.set_continue_timeout_progress, i)
 
-        invoke_in_main_thread(self.ui_controller.set_continue_controls_enabled, enabled=False)
+        self.invoke(self.ui_controller.set_continue_controls_enabled, enabled=False)
 
     #######################################################################################################
     #########################           MAIN LOOP THAT RUNS STATE MACHINE                ##################
@@ -828,11 +864,12 @@ class Game:
     def play(self):
         over = False
         # Print game information
-        print(f"Total players = {self.n_players} - Human Player ID is: {self.player_ID}")
-        print(f'Strategies: {[self.players[i].strategy for i in range(self.n_players)]} \n')
+        self.log(f"Total players = {self.n_players} - Human Player ID is: {self.player_ID}")
+        self.log(f'Strategies: {[self.players[i].strategy for i in range(self.n_players)]} \n')
         self.reasoning_file.write(f"<div class='topbox'>")
         for i in range(1, self.n_players):
-            self.reasoning_file.write(f"<div class='playerbox' style='background-color:{playercolors[i]};'>"
+            color = playercolors[1 + (i - 1) % (len(playercolors) - 1)]  # colors repeat for large tables
+            self.reasoning_file.write(f"<div class='playerbox' style='background-color:{color};'>"
                                       f"Player {i}</div>")
         self.reasoning_file.write(f"</div>")
 
@@ -856,8 +893,8 @@ class Game:
                 self.clear_ui_bets()
                 self.current_bid = Bid(1, 0)
                 self.update_turn(reset=True)
-                print('----------------- NEW ROUND ----------------------')
-                if self.n_total_dice == self.n_players * 5:
+                self.log('----------------- NEW ROUND ----------------------')
+                if self.n_total_dice == self.n_players * self.n_starting_dice:
                     self.round = 1
                 else:
                     self.round += 1
@@ -867,18 +904,19 @@ class Game:
                     f"<div class='roundbox' style='margin-top:50px;'><div class='roundtitle'>Round {self.round}</div>")
                 self.all_roll()
 
-                print(f'All players rolled the dice! My hand is {self.players[0].hand} \n'
-                      f'Total number of dice remaining = {self.n_total_dice} \n')
+                self.log(f'All players rolled the dice! My hand is {self.players[0].hand} \n'
+                         f'Total number of dice remaining = {self.n_total_dice} \n')
 
-                invoke_in_main_thread(self.ui_controller.display_dice, player_nr=self.player_ID,
-                                      dice=self.players[self.player_ID].hand,
-                                      highlight=0)
+                if self.player_ID is not None:
+                    self.invoke(self.ui_controller.display_dice, player_nr=self.player_ID,
+                                dice=self.players[self.player_ID].hand,
+                                highlight=0)
 
                 for idx, player in enumerate(self.players):  # Counts dice, which also determines winner
                     if idx > 0:
-                        invoke_in_main_thread(self.ui_controller.display_dice, player_nr=idx,
-                                              dice=player.get_hand_size(),
-                                              state=0)
+                        self.invoke(self.ui_controller.display_dice, player_nr=idx,
+                                    dice=player.get_hand_size(),
+                                    state=0)
 
                 for idx, player in enumerate(self.players):  # Counts dice, which also determines winner
                     if idx != self.player_ID and (
@@ -886,25 +924,25 @@ class Game:
                         self.reasoning_file.write(
                             f"<p class='t{idx}'> My hand is {self.players[idx].hand}</p>")
 
-                print(f'[FIRST TURN]: Player {self.current_player}')
+                self.log(f'[FIRST TURN]: Player {self.current_player}')
                 if self.current_player != self.player_ID:
                     self.reasoning_file.write(
                         f"<p class='turntitle tn{self.current_player}'>Player {self.current_player}'s turn (first):</p>")
-                    invoke_in_main_thread(self.ui_controller.show_info, string=f"Player {self.current_player}'s turn.")
+                    self.invoke(self.ui_controller.show_info, string=f"Player {self.current_player}'s turn.")
                 else:
                     self.reasoning_file.write(
                         f"<p class='turntitle tn{self.current_player}'>Your turn (first):</p>")
-                    invoke_in_main_thread(self.ui_controller.show_info, string=f"Your turn.")
+                    self.invoke(self.ui_controller.show_info, string=f"Your turn.")
 
                 if self.current_player != self.player_ID:
                     self.reasoning_file.write(
                         f"<p class='t{self.current_player}'>Player {self.current_player} can bid first:</p>")
-                    invoke_in_main_thread(self.ui_controller.display_action_enemy,
-                                          enemy_nr=self.current_player,
-                                          action=0)
+                    self.invoke(self.ui_controller.display_action_enemy,
+                                enemy_nr=self.current_player,
+                                action=0)
 
-                    y = random.uniform(2.5, 4)
-                    time.sleep(
+                    y = self.players[self.current_player].rng.uniform(2.5, 4)
+                    self.sleep(
                         y)  # agent 'thinking'  (First turn means never any chunks stored, so random time addition can be both for models and random opponents)
 
                 self.state = states['bidding_phase']
@@ -914,10 +952,10 @@ class Game:
             # Check whether the current player wants to doubt before asking the bid.
             if self.state == states['doubting_phase']:
                 if self.current_player == self.player_ID:
-                    print(
+                    self.log(
                         f'My hand is {self.players[self.player_ID].hand} \nTotal number of dice remaining = {self.n_total_dice}')
-                    invoke_in_main_thread(self.ui_controller.display_dice, player_nr=self.player_ID,
-                                          dice=self.players[self.player_ID].hand)
+                    self.invoke(self.ui_controller.display_dice, player_nr=self.player_ID,
+                                dice=self.players[self.player_ID].hand)
 
                 if self.current_player != self.player_ID:
                     self.reasoning_file.write(
@@ -926,34 +964,34 @@ class Game:
                     self.reasoning_file.write(
                         f"<p class='turntitle tn{self.current_player}'>Your turn:</p>")
 
-                print(f'[TURN]: Player {self.current_player}')
+                self.log(f'[TURN]: Player {self.current_player}')
 
                 if self.current_player != self.player_ID:
-                    invoke_in_main_thread(self.ui_controller.show_info, string=f"Player {self.current_player}'s turn.")
+                    self.invoke(self.ui_controller.show_info, string=f"Player {self.current_player}'s turn.")
                 else:
-                    invoke_in_main_thread(self.ui_controller.show_info, string=f"Your turn.")
+                    self.invoke(self.ui_controller.show_info, string=f"Your turn.")
 
                 if self.current_player != self.player_ID:
-                    invoke_in_main_thread(self.ui_controller.display_action_enemy,
-                                          enemy_nr=self.current_player,
-                                          action=0)
-                    # time.sleep(random.uniform(1.5, 4))  # agent 'thinking'
+                    self.invoke(self.ui_controller.display_action_enemy,
+                                enemy_nr=self.current_player,
+                                action=0)
+                    # self.sleep(random.uniform(1.5, 4))  # agent 'thinking'
 
                 doubt = self.doubting()
 
                 if doubt:
-                    print(f'Player {self.current_player} does not believe the bid of Player {self.previous_player}')
+                    self.log(f'Player {self.current_player} does not believe the bid of Player {self.previous_player}')
                     if self.current_player != self.player_ID:
-                        invoke_in_main_thread(fn=self.ui_controller.display_action_enemy,
-                                              enemy_nr=self.current_player,
-                                              action=1,
-                                              target=self.previous_player)
+                        self.invoke(fn=self.ui_controller.display_action_enemy,
+                                    enemy_nr=self.current_player,
+                                    action=1,
+                                    target=self.previous_player)
 
                     self.state = states['resolve_doubt']
 
                 else:
                     self.state = states['bidding_phase']
-                    print(f'Player {self.current_player} believes the bid -> ', end='')
+                    self.log(f'Player {self.current_player} believes the bid -> ', end='')
                 continue
 
             # -----------------------------------------Resolve doubt-------------------------------------------- #
@@ -969,18 +1007,18 @@ class Game:
             if self.state == states['bidding_phase']:
 
                 self.bidding()
-                print(f'Player {self.current_player} has bid {self.current_bid.count} x {self.current_bid.roll}')
+                self.log(f'Player {self.current_player} has bid {self.current_bid.count} x {self.current_bid.roll}')
                 if self.current_player != self.player_ID:
-                    invoke_in_main_thread(self.ui_controller.display_bet_enemy, enemy_nr=self.current_player,
-                                          number=self.current_bid.count, dice=self.current_bid.roll)
+                    self.invoke(self.ui_controller.display_bet_enemy, enemy_nr=self.current_player,
+                                number=self.current_bid.count, dice=self.current_bid.roll)
 
                 if self.previous_player != self.player_ID and self.previous_player != self.current_player:
-                    invoke_in_main_thread(self.ui_controller.display_bet_enemy, enemy_nr=self.previous_player,
-                                          number="", dice=0)
+                    self.invoke(self.ui_controller.display_bet_enemy, enemy_nr=self.previous_player,
+                                number="", dice=0)
 
                 if self.current_player != self.player_ID:
-                    invoke_in_main_thread(self.ui_controller.display_action_enemy, enemy_nr=self.current_player,
-                                          action=2)
+                    self.invoke(self.ui_controller.display_action_enemy, enemy_nr=self.current_player,
+                                action=2)
 
                 self.models_remember_bid()
 
@@ -992,15 +1030,17 @@ class Game:
             if self.state == states['end']:
                 over = True
                 if len(winner) <= 1:
-                    print(f"Player {winner[0]} has played away all its dice and won the game!.")
-                    invoke_in_main_thread(self.ui_controller.display_winner_and_close, players=winner)
+                    self.log(f"Player {winner[0]} has played away all its dice and won the game!.")
+                    self.invoke(self.ui_controller.display_winner_and_close, players=winner)
                 else:
                     winners = str(winner)[1:-1]
-                    print(f"Players {winners} have played away all their dice and won the game!.")
-                    invoke_in_main_thread(self.ui_controller.display_winner_and_close, players=winner)
+                    self.log(f"Players {winners} have played away all their dice and won the game!.")
+                    self.invoke(self.ui_controller.display_winner_and_close, players=winner)
                 continue
 
-        # print(f'Chunks retrieved during game: {self.chunk_retrieval_count}')
-        # print(f'Chunk retrieve failures during game: {self.chunk_retrieval_failure_count}')
-        print('Game Finished!')
+        # self.log(f'Chunks retrieved during game: {self.chunk_retrieval_count}')
+        # self.log(f'Chunk retrieve failures during game: {self.chunk_retrieval_failure_count}')
+        self.log('Game Finished!')
+        if self.headless:
+            return winner
         quit(0)
@@ -1,7 +1,25 @@
+import json
 import math
-import random
+import struct
 
-from dmchunk import Chunk
+import numpy as np
+
+from declarative_memory import DeclarativeMemory
+from dmchunk import Chunk, Encounters, content_key
+
+SNAPSHOT_MAGIC = b'PLDSNAP1'
+SNAPSHOT_PARAMETERS = ['ga', 'mas', 'd', 'ol', 's', 'lf', 'le', 'rt', 'mp', 'forgetting', 'fm', 'capacity']
+MISSING = object()  # Stands in for the value of a slot that a chunk does not have
+
+
+def log_sum_exp(values):
+    """
+    Compute log(sum(exp(values))) without overflow, by factoring out the largest value
+    """
+    if len(values) == 0:
+        return -np.inf
+    largest = np.max(values)
+    return largest + np.log(np.sum(np.exp(values - largest)))
 
 
 class Model(object):
@@ -11,6 +29,7 @@ class Model(object):
     mas = 2.0  # maxmimum spreading (:mas; default: 2.0)
 
     d = 0.5  # decay (:bll; default: 0.5)
+    ol = None  # optimized learning: number of most recent encounters kept exact (:ol; None: exact base-level)
     s = 0.2  # scale of activation noise (:ans; default: 0)
 
     lf = 0.1  # latency factor (:lf; default: 0.1)
@@ -20,20 +39,44 @@ class Model(object):
 
     mp = 3.0  # mismatch penalty (:mp)
 
-    def __init__(self):
+    forgetting = False  # permanently drop chunks whose activation can no longer reach rt (see Model.forget)
+    fm = 0.0  # forgetting margin, on top of the maximum noise and spreading activation
+    capacity = None  # hard limit on the number of chunks in DM, least active ones are dropped first (None: unbounded)
+
+    def __init__(self, seed=None):
+        """
+        :param seed: Seed (or numpy SeedSequence / Generator) for the model's own activation noise stream.
+        """
         self.time = 0
+        self.dm = DeclarativeMemory()
+        self.fan_version = 0  # Incremented whenever a fan in DM changes
+        self.init_state(seed)
+
+    def init_state(self, seed=None):
+        """
+        Set up the goal, the activation noise stream and the caches of the model, apart from its DM and clock.
+        :param seed: Seed (or numpy SeedSequence / Generator) for the model's own activation noise stream.
+        """
         self.goal = None
-        self.dm = []
+        self.rng = np.random.default_rng(seed)
+
+        # Spreading activation per goal slot value, valid as long as spreading_table_key does not change
+        self.spreading_table = {}
+        self.spreading_table_key = None
+
+        # Noiseless activations of chunks, valid as long as activation_cache_key does not change
+        self.activation_cache = {}
+        self.activation_cache_key = None
+
+        self.mismatch_tables = {}  # Pattern value -> {slot value: mismatch}, see Model.get_mismatch_table
+
+        self.forget_size = 16  # DM size at which forgetting next sweeps DM, doubled after every sweep
 
     def get_chunk(self, name):
         """
         Find the Chunk given its name
         """
-        chunk_idx = [i for i, j in enumerate(self.dm) if j.name == name]
-        if len(chunk_idx) == 0:
-            return None
-        else:
-            return self.dm[chunk_idx[0]]
+        return self.dm.get(name)
 
     def add_encounter(self, chunk):
         """
@@ -44,18 +87,20 @@ class Model(object):
         update_fan = False
 
         # If a chunk by this name does not yet exist, add it to DM
-        if chunk.name not in [chunk.name for chunk in self.dm]:
-            self.dm.append(chunk)
+        existing = self.dm.get(chunk.name)
+        if existing is None:
+            self.dm.add(chunk)
+            existing = chunk
             update_fan = True
 
         # If a chunk by this name does exist, ensure that it has the same slots and slot values
-        chunk_idx = [i for i, j in enumerate(self.dm) if j.name == chunk.name][0]
-        if self.dm[chunk_idx].slots != chunk.slots:
+        if existing.slots != chunk.slots:
             raise ValueError(
                 "Trying to add an encounter to a chunk with the same name (%s) but different slots and/or slot values" % chunk.name)
 
         # Add an encounter at the current time
-        self.dm[chunk_idx].add_encounter(self.time)
+        existing.add_encounter(self.time)
+        self.activation_cache = {}
 
         slot_vals = chunk.slots.values()
 
@@ -68,9 +113,70 @@ class Model(object):
 
         # Increment the fan of all chunks that this chunk references in its slots
         if update_fan:
-            refs = [i for i, ref in enumerate(self.dm) if ref.name in slot_vals]
-            for ref in refs:
-                self.dm[ref].fan += 1
+            for value in set(slot_vals):
+                ref = self.dm.get(value)
+                if ref is not None:
+                    ref.fan += 1
+                    self.fan_version += 1
+
+            if (self.forgetting and len(self.dm) >= self.forget_size) or \
+                    (self.capacity is not None and len(self.dm) > self.capacity):
+                self.forget(keep=existing)
+
+    def add_encounter_by_content(self, slots):
+        """
+        Add an encounter at the current time of the chunk with the specified slots and slot values.
+        If there is no such chunk yet, it is created with a name derived from its content (see content_key).
+        :return: The encountered chunk
+        """
+        chunk = self.dm.get_by_content(slots)
+        if chunk is None:
+            chunk = Chunk(name=content_key(slots), slots=slots)
+        self.add_encounter(chunk)
+        return chunk
+
+    def forget(self, keep=None):
+        """
+        Permanently remove chunks from DM that can no longer be retrieved: base-level activation only decays until
+        a chunk is encountered again, so once it is below rt even with maximum noise and spreading activation, it
+        stays there. Only chunks without encounters at or after the current time can be forgotten this way.
+        If DM still holds more than capacity chunks, the chunks with the lowest base-level activation are removed as
+        well. Chunks with encounters at or after the current time count as the most active ones, and among them the
+        chunks that were added first are removed first.
+        :param keep: Chunk that is never removed (e.g. the chunk that was just added).
+        :return: The removed chunks
+        """
+        chunks = list(self.dm)
+        settled = np.array([ch.encounters[-1] < self.time for ch in chunks], dtype=bool)
+        activations = np.full(len(chunks), np.inf)
+        if settled.any():
+            activations[settled] = self.get_baselevel_activations([ch for ch, s in zip(chunks, settled) if s])
+        drop = np.zeros(len(chunks), dtype=bool)
+
+        if self.forgetting:
+            max_noise = self.s * math.log(0.999 / 0.001)  # see Model.noise
+            max_spreading = self.ga * self.mas
+            drop |= activations + max_noise + max_spreading + self.fm < self.rt
+
+        if self.capacity is not None:
+            excess = len(chunks) - int(drop.sum()) - self.capacity
+            if excess > 0:
+                kept = np.flatnonzero(~drop & np.array([ch is not keep for ch in chunks], dtype=bool))
+                drop[kept[np.argsort(activations[kept], kind='stable')[:excess]]] = True
+
+        removed = [ch for ch, dropped in zip(chunks, drop.tolist()) if dropped]
+        if removed:
+            self.dm.remove(removed)
+            for ch in removed:
+                for value in set(ch.slots.values()):
+                    ref = self.dm.get(value)
+                    if ref is not None:
+                        ref.fan -= 1
+            self.fan_version += 1  # also when a removed chunk was itself referenced, it no longer spreads activation
+            self.activation_cache = {}
+
+        self.forget_size = max(16, 2 * len(self.dm))
+        return removed
 
     def get_activation_no_noise(self, chunk):
         """
@@ -80,16 +186,73 @@ class Model(object):
         if chunk not in self.dm:
             raise ValueError("The specified chunk (%s) does not exist in DM" % str(chunk.name))
 
-        # There should be at least one past encounter of the chunk
-        if self.time <= min(chunk.encounters):
-            raise ValueError("Chunk %s not encountered at or before time %s" % (str(chunk.name), str(self.time)))
+        return self.get_activations_no_noise([chunk])[0]
+
+    def get_baselevel_activations(self, chunks):
+        """
+        Get the base-level activation of each of the specified chunks at the current time, as an array.
+        The encounters of all chunks are decayed in one vectorized pass. If ol is set, only the ol most recent
+        encounters of a chunk are decayed exactly, and the older ones are approximated.
+        """
+        n_past = np.empty(len(chunks), dtype=np.intp)
+        first = np.empty(len(chunks))  # time of the first encounter
+        kth = np.empty(len(chunks))  # time of the oldest encounter that is kept exact
+        windows = []
+        for i, ch in enumerate(chunks):
+            times = ch.encounters.array
+            n = int(np.searchsorted(times, self.time))  # encounters are sorted, so these are the past ones
+
+            # There should be at least one past encounter of the chunk
+            if n == 0:
+                raise ValueError("Chunk %s not encountered at or before time %s" % (str(ch.name), str(self.time)))
+
+            start = 0 if self.ol is None else max(0, n - self.ol)
+            windows.append(times[start:n])
+            n_past[i] = n
+            first[i] = times[0]
+            kth[i] = times[start] if start < n else self.time
+
+        lengths = np.fromiter(map(len, windows), dtype=np.intp, count=len(chunks))
+        ages = self.time - (np.concatenate(windows) if chunks else np.empty(0))
+        owners = np.repeat(np.arange(len(chunks)), lengths)
+        total = np.bincount(owners, weights=ages ** -self.d, minlength=len(chunks)).astype(float)
+
+        # Petrov (2006) hybrid approximation: the older encounters are assumed to be spread evenly between the
+        # first encounter and the oldest exact one, which gives a closed form for their summed decay
+        n_older = n_past - lengths
+        older = n_older > 0
+        if older.any():
+            t_n = self.time - first[older]
+            t_k = self.time - kth[older]
+            total[older] += n_older[older] * (t_n ** (1 - self.d) - t_k ** (1 - self.d)) / (
+                    (1 - self.d) * (t_n - t_k))
+
+        return np.log(total)
+
+    def get_activations_no_noise(self, chunks):
+        """
+        Get the activations of the specified chunks at the current time as an array, but without noise.
+        Activations are cached until the time, goal, decay or spreading parameters change, or an encounter is added.
+        """
+        cache_key = (self.time, self.goal, self.fan_version, self.d, self.ol, self.ga, self.mas)
+        if cache_key != self.activation_cache_key:
+            self.activation_cache = {}
+            self.activation_cache_key = cache_key
 
-        baselevel_activation = math.log(
-            sum([(self.time - encounter) ** -self.d for encounter in chunk.encounters if encounter < self.time]))
+        missing = [ch for ch in chunks if ch not in self.activation_cache]
+        if missing:
+            activations = self.get_baselevel_activations(missing)
+            if self.get_spreading_table():
+                activations += [self.get_spreading_activation_from_goal(ch) for ch in missing]
+            self.activation_cache.update(zip(missing, activations.tolist()))
 
-        spreading_activation = self.get_spreading_activation_from_goal(chunk)
+        return np.array([self.activation_cache[ch] for ch in chunks], dtype=float)
 
-        return baselevel_activation + spreading_activation
+    def get_activations(self, chunks):
+        """
+        Get the activations of the specified chunks at the current time as an array, with independent noise per chunk
+        """
+        return self.get_activations_no_noise(chunks) + self.noise(self.s, len(chunks))
 
     def get_activation(self, chunk):
         """
@@ -104,34 +267,43 @@ class Model(object):
         activation = self.get_activation(chunk)
         return self.lf * math.exp(-self.le * activation)
 
-    def noise(self, s):
+    def noise(self, s, size=None):
         """
         Generate activation noise by drawing a value from a logistic distribution with mean 0 and scale s.
+        If size is given, an array of that many independent draws is returned.
         """
-        rand = random.uniform(0.001, 0.999)
-        return s * math.log((1 - rand) / rand)
+        rand = self.rng.uniform(0.001, 0.999, size)
+        return s * np.log((1 - rand) / rand)
 
-    def get_spreading_activation_from_goal(self, chunk):
+    def get_spreading_table(self):
         """
-        Calculate the amount of spreading activation from the goal buffer to the specified chunk.
+        Get the spreading activation that each goal slot value sends to the chunks that contain it, as a dict.
+        The table is only recomputed when the goal or the fans in DM change.
         """
+        table_key = (self.goal, self.fan_version, self.ga, self.mas)
+        if table_key == self.spreading_table_key:
+            return self.spreading_table
 
-        if self.goal is None:
-            return 0
-
-        if type(self.goal) is Chunk:
-            spreading = 0.0
-            total_slots = 0
+        table = {}
+        if type(self.goal) is Chunk and len(self.goal.slots) > 0:
+            weight = self.ga / len(self.goal.slots)
             for value in self.goal.slots.values():
-                total_slots += 1
                 ch1 = self.get_chunk(value)
-                if ch1 != None and value in chunk.slots.values() and ch1.fan > 0:
-                    spreading += max(0, self.mas - math.log(ch1.fan))
+                if ch1 != None and ch1.fan > 0:
+                    table[value] = table.get(value, 0.0) + weight * max(0, self.mas - math.log(ch1.fan))
 
-        if total_slots == 0:
-            return 0
+        self.spreading_table = table
+        self.spreading_table_key = table_key
+        return table
 
-        return spreading * (self.ga / total_slots)
+    def get_spreading_activation_from_goal(self, chunk):
+        """
+        Calculate the amount of spreading activation from the goal buffer to the specified chunk.
+        """
+        table = self.get_spreading_table()
+        if not table:
+            return 0
+        return sum([table.get(value, 0.0) for value in set(chunk.slots.values())])
 
     def match(self, chunk1, pattern):
         """
@@ -149,17 +321,57 @@ class Model(object):
         """
         bestMatch = None
         bestActivation = self.rt
-        for ch in self.dm:
-            act = self.get_activation(ch)
-            if self.match(ch, chunk) and act > bestActivation:
-                bestMatch = ch
-                bestActivation = act
+        candidates = self.dm.matching(chunk.slots)
+        if candidates:
+            activations = self.get_activations(candidates)
+            best = int(np.argmax(activations))
+            if activations[best] > bestActivation:
+                bestMatch = candidates[best]
+                bestActivation = float(activations[best])
         if bestMatch == None:
             latency = self.lf * math.exp(-self.le * self.rt)
         else:
             latency = self.lf * math.exp(-self.le * bestActivation)  # calculate it here to avoid a new noise draw
         return bestMatch, latency
 
+    def retrieve_many(self, patterns, models=None):
+        """
+        Retrieve the chunk with the highest activation for each of several request patterns. Each request is answered
+        by this model, or by the model at the same position in models. The noiseless activations of all candidate
+        chunks are computed once per model and the noise for all requests is drawn in one batch, but independently per
+        request, so the results are distributed as for separate calls to retrieve.
+        Returns a list with a (chunk or None, latency) tuple per pattern
+        """
+        if models is None:
+            models = [self] * len(patterns)
+
+        requests = {}  # id(model) -> (model, indices of its requests)
+        for i, model in enumerate(models):
+            requests.setdefault(id(model), (model, []))[1].append(i)
+
+        results = [None] * len(patterns)
+        for model, indices in requests.values():
+            candidates = [model.dm.matching(patterns[i].slots) for i in indices]
+            union = list(dict.fromkeys([ch for chunks in candidates for ch in chunks]))
+            positions = dict([(ch, pos) for pos, ch in enumerate(union)])
+            activations = model.get_activations_no_noise(union)
+
+            lengths = [len(chunks) for chunks in candidates]
+            noise = np.split(model.noise(model.s, sum(lengths)), np.cumsum(lengths)[:-1])
+
+            for i, chunks, request_noise in zip(indices, candidates, noise):
+                bestMatch = None
+                bestActivation = model.rt
+                if chunks:
+                    request_activations = activations[[positions[ch] for ch in chunks]] + request_noise
+                    best = int(np.argmax(request_activations))
+                    if request_activations[best] > bestActivation:
+                        bestMatch = chunks[best]
+                        bestActivation = float(request_activations[best])
+                results[i] = (bestMatch, model.lf * math.exp(-model.le * bestActivation))
+
+        return results
+
     def mismatch(self, value1, value2):
         """
         Calculate the mismatch between two slot values. If the two values are the same, the mismatch is 0.
@@ -171,6 +383,24 @@ class Model(object):
             return None
         return -math.sqrt(abs(float(value1) - float(value2))) / 5
 
+    def get_mismatch_table(self, value, values):
+        """
+        Get a dict with the mismatch between each of the specified chunk slot values and the pattern value (see
+        Model.mismatch). Mismatches are kept per pattern value, and only values that were not seen before are computed,
+        numbers all at once.
+        """
+        table = self.mismatch_tables.setdefault(value, {})
+        new = [v for v in set(values) if v is not MISSING and v not in table]
+        if new:
+            if type(value) in (int, float):
+                numbers = [v for v in new if type(v) in (int, float) and v != value]
+                distances = np.abs(np.array(numbers, dtype=float) - float(value))
+                table.update(zip(numbers, (-np.sqrt(distances) / 5).tolist()))
+            for v in new:
+                if v not in table:
+                    table[v] = self.mismatch(v, value)
+        return table
+
     def partial_match(self, chunk, pattern):
         """
         Retrieve a chunk using partial matching.
@@ -190,17 +420,33 @@ class Model(object):
         Retrieve a chunk using partial matching. This version only partially matches on numbers, and will
         use a predefined distance function
         """
+        # String values never partially match, so only chunks with those exact values are candidates
+        exact_slots = dict([(slot, value) for slot, value in chunk.slots.items() if type(value) == str])
+
+        candidates = self.dm.matching(exact_slots)
+        activations = self.get_activations(candidates)
+
+        # Sum the mismatch penalties of the other slots per candidate, NaN where a chunk cannot match
+        penalties = np.zeros(len(candidates))
+        for slot, value in chunk.slots.items():
+            if slot not in exact_slots:
+                column = [ch.slots.get(slot, MISSING) for ch in candidates]
+                table = self.get_mismatch_table(value, column)
+                penalties += np.array([table.get(v) for v in column], dtype=float) * self.mp
+        matching = ~np.isnan(penalties)
+
+        if trace == True:
+            for i in np.flatnonzero(matching):
+                print("Chunk %s has activation %f and penalty %f" % (candidates[i].name, activations[i], penalties[i]))
+
         bestMatch = None
         bestActivation = self.rt
-        for ch in self.dm:
-            act = self.get_activation(ch)
-            penalty = self.partial_match(ch, chunk)
-
-            if penalty != None and act + penalty > bestActivation:
-                bestMatch = ch
-                bestActivation = act + penalty
-            if trace == True and penalty != None:
-                print("Chunk %s has activation %f and penalty %f" % (ch.name, act, penalty))
+        if matching.any():
+            scores = np.where(matching, activations + penalties, -np.inf)
+            best = int(np.argmax(scores))
+            if scores[best] > bestActivation:
+                bestMatch = candidates[best]
+                bestActivation = float(scores[best])
         if bestMatch == None:
             latency = self.lf * math.exp(-self.le * self.rt)
         else:
@@ -212,25 +458,123 @@ class Model(object):
         Returns the probability of retrieving a specific chunk that matches the specified pattern,
         given its activation and the activation of the other matching chunks
         """
-        activations = dict([(ch, self.get_activation_no_noise(ch)) for ch in self.dm if self.match(ch, pattern)])
-        return math.exp(activations[chunk] / self.s) / sum([math.exp(a / self.s) for a in activations.values()])
+        chunks = self.dm.matching(pattern.slots)
+        scaled = self.get_activations_no_noise(chunks) / self.s
+        return float(np.exp(scaled[chunks.index(chunk)] - log_sum_exp(scaled)))
+
+    def get_retrieval_distribution(self, pattern):
+        """
+        Returns the chunks that match the specified pattern, an array with the probability of retrieving each of them,
+        and the probability of a retrieval failure, for which the retrieval threshold competes like a chunk with
+        activation rt. Computed in one log-sum-exp over the noiseless activations, so high activations do not overflow.
+        """
+        chunks = self.dm.matching(pattern.slots)
+        scaled = np.append(self.get_activations_no_noise(chunks), self.rt) / self.s
+        probabilities = np.exp(scaled - log_sum_exp(scaled))
+        return chunks, probabilities[:-1], float(probabilities[-1])
 
     def retrieve_blended_trace(self, pattern, slot):
         """
         Returns a blend of the requested slot value from all chunks in DM that match the specified pattern, weighted by their activation
         """
+        blended_values, latency = self.retrieve_blended(pattern, [slot])
+        return blended_values[slot], latency
 
-        latency = self.lf * math.exp(-self.le * self.rt)  # Latency is determined by the retrieval threshold
-
-        eligible_chunks = [ch for ch in self.dm if self.match(ch, pattern) and slot in ch.slots and ch.slots[slot]]
-
-        if not eligible_chunks:
-            return None, latency
+    def retrieve_blended(self, pattern, slots):
+        """
+        Returns a dict with a blend of each of the requested slot values from all chunks in DM that match the specified
+        pattern and have a (non-empty) value for that slot, weighted by their retrieval probability, or None if there
+        are no such chunks. Activations are computed (or taken from the cache) once for all slots, and the weights are
+        normalised with log-sum-exp.
+        """
 
-        chunk_probs = dict([(ch, math.exp(self.get_activation_no_noise(ch) / self.s)) for ch in eligible_chunks])
-        blended_value = sum([ch.slots[slot] * prob / sum(chunk_probs.values()) for ch, prob in chunk_probs.items()])
+        latency = self.lf * math.exp(-self.le * self.rt)  # Latency is determined by the retrieval threshold
 
-        return blended_value, latency
+        columns = dict([(slot, []) for slot in slots])
+        eligible_chunks = []
+        for ch in self.dm.matching(pattern.slots):
+            values = [ch.slots.get(slot) for slot in slots]
+            if any(values):
+                eligible_chunks.append(ch)
+                for slot, value in zip(slots, values):
+                    columns[slot].append(value)
+
+        scaled = self.get_activations_no_noise(eligible_chunks) / self.s
+
+        blended_values = {}
+        for slot, column in columns.items():
+            eligible = np.array([bool(value) for value in column], dtype=bool)
+            if not eligible.any():
+                blended_values[slot] = None
+                continue
+            weights = np.exp(scaled[eligible] - log_sum_exp(scaled[eligible]))
+            values = np.array([value for value in column if value], dtype=float)
+            blended_values[slot] = float(np.dot(weights, values))
+
+        return blended_values, latency
+
+    def save(self, path):
+        """
+        Write the model's time, parameters and declarative memory (chunks, slots, encounter times and fans)
+        to a binary snapshot file. Slot values and chunk names must be JSON serializable.
+        Layout: magic, header length, JSON header padded to 8 bytes, then the little-endian arrays
+        encounter times (float64), encounter offsets per chunk (int64) and fans (int64).
+        """
+        chunks = list(self.dm)
+        times = [ch.encounters.array for ch in chunks]
+        offsets = np.zeros(len(chunks) + 1, dtype='<i8')
+        np.cumsum([len(t) for t in times], out=offsets[1:])
+
+        header = json.dumps({'time': self.time,
+                             'n_encounters': int(offsets[-1]),
+                             'parameters': dict([(p, getattr(self, p)) for p in SNAPSHOT_PARAMETERS]),
+                             'chunks': [[ch.name, ch.slots] for ch in chunks]}).encode()
+        header += b' ' * (-len(header) % 8)
+
+        with open(path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            f.write(np.concatenate(times).astype('<f8').tobytes() if chunks else b'')
+            f.write(offsets.tobytes())
+            f.write(np.array([ch.fan for ch in chunks], dtype='<i8').tobytes())
+
+    @classmethod
+    def load(cls, path, seed=None, mmap=True):
+        """
+        Create a model from a snapshot written by Model.save.
+        With mmap, the encounter times are memory-mapped rather than read, and only copied per chunk
+        when that chunk is encountered again.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError("%s is not a model snapshot" % path)
+            header_length, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_length))
+
+        n_chunks = len(header['chunks'])
+        n_times = header['n_encounters']
+        arrays_offset = len(SNAPSHOT_MAGIC) + 8 + header_length
+        if mmap:
+            arrays = np.asarray(np.memmap(path, dtype='<f8', mode='r', offset=arrays_offset,
+                                          shape=(n_times + 2 * n_chunks + 1,)))
+        else:
+            arrays = np.fromfile(path, dtype='<f8', offset=arrays_offset)
+        times = arrays[:n_times]
+        offsets = arrays[n_times:n_times + n_chunks + 1].view('<i8')
+        fans = arrays[n_times + n_chunks + 1:].view('<i8')
+
+        model = cls(seed)
+        model.time = header['time']
+        for p, value in header['parameters'].items():
+            setattr(model, p, value)
+        for i, (name, slots) in enumerate(header['chunks']):
+            chunk = Chunk(name, slots)
+            chunk.encounters = Encounters.view(times[offsets[i]:offsets[i + 1]])
+            chunk.fan = int(fans[i])
+            model.dm.add(chunk)
+        model.forget_size = max(16, 2 * len(model.dm))
+        return model
 
     def __str__(self):
         return "\n=== Model ===\n" \
@@ -1,27 +1,39 @@
-import random
+import numpy as np
 
 from dmchunk import Chunk
 from model import Model
 
 
 class Player:
-    def __init__(self, n_starting_dice, difficulty):
+    def __init__(self, n_starting_dice, difficulty, warm_start=None, seed=None, dice=None):
         """
         Defines an object Player in a game of Liar's Dice.\n
         :param n_dice: Number of dice the player is initialized with.
+        :param warm_start: Path of a model snapshot (see Model.save) that the model's memory starts from.
+        :param seed: Seed (or numpy SeedSequence) of the player's own random streams: its policy (rng), the activation
+        noise of its models and, unless dice is given, its dice.
+        :param dice: numpy Generator that the player's dice are rolled with (e.g. one shared by the table).
         """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        policy_seed, self.memory_seed, dice_seed = seed.spawn(3)
+        self.rng = np.random.default_rng(policy_seed)  # random choices and thinking times of the player
+        if dice is None:
+            dice = np.random.default_rng(dice_seed)
+        self.dice = dice
+
         self.n_dice = n_starting_dice
-        self.hand = []
+        self.hand = []  # values of the dice, in ascending order
+        self.counts = np.zeros(6, dtype=int)  # number of dice in the hand with each value 1 to 6
+        self.warm_start = warm_start
 
         if difficulty == 1:
             self.strategy = 'random'
         elif difficulty == 2:
             self.strategy = 'model'
-            self.model = Model()
+            self.model = self.new_model()
 
-        for _ in range(n_starting_dice):  # die object redundant, using ints is probably easier
-            self.hand.append(random.randint(1, 6))
-        self.hand.sort()
+        self.roll_hand()
 
 
     def get_hand_size(self):
@@ -33,7 +45,9 @@ class Player:
         :return: The removed die.
         """
         self.n_dice -= 1
-        return self.hand.pop()
+        die = self.hand.pop()
+        self.counts[die - 1] -= 1
+        return die
 
 
     def roll_hand(self):
@@ -42,21 +56,47 @@ class Player:
         :return: The new hand.
         """
 
-        self.hand = []
-        for _ in range(self.n_dice):  # die object redundant, using ints is probably easier
-            self.hand.append(random.randint(1, 6))
-        self.hand.sort()
+        self.set_hand(self.dice.integers(1, 7, size=self.n_dice))
 
-    def get_roll_count(self, roll):
+    def set_hand(self, dice):
+        """
+        Puts rolled dice in the player's hand (e.g. when all dice on the table are rolled at once).\n
+        :param dice: numpy array with the values of the dice, one for each die of the player.
+        """
+        self.counts = np.bincount(dice - 1, minlength=6)
+        self.hand = sorted(dice.tolist())
+
+    def get_roll_count(self, roll, jokers=False):
         """
         Counts the number of dice in the hand with the determined value.\n
         :param roll: The value of the dice to be counted.\n
+        :param jokers: Whether joker dice (1) also count, as they do for bids on other values.\n
         :return: The number of dice with the determined value.
         """
-        return self.hand.count(roll)
+        count = self.counts[roll - 1]
+        if jokers and roll != 1:
+            count += self.counts[0]
+        return int(count)
+
+    def get_most_common(self):
+        """
+        Finds the most common dice values in the hand.\n
+        :return: The most common values (in ascending order), and the number of dice with each of those values.
+        """
+        n_of_most = int(self.counts.max())
+        return (np.flatnonzero(self.counts == n_of_most) + 1).tolist(), n_of_most
+
+    def new_model(self):
+        """
+        Creates a fresh model, starting from the warm start snapshot if the player has one.
+        """
+        seed = self.memory_seed.spawn(1)[0]  # every model gets its own noise stream
+        if self.warm_start is not None:
+            return Model.load(self.warm_start, seed=seed)
+        return Model(seed=seed)
 
     def renew_model(self):
-        self.model = Model()
+        self.model = self.new_model()
         self.reasoning_string = ''
 
     def add_to_reasoning_string(self, string):
@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.stats import binom
+
+
+@lru_cache(maxsize=None)
+def tail_probabilities(n_unknown_dice, roll_prob):
+    """
+    Builds the table of probabilities of at least k times a dice value in n unknown dice, for k = 0 .. n + 1.
+    Built once per number of unknown dice and roll probability, then reused.
+    """
+    pmf = binom.pmf(np.arange(n_unknown_dice + 1), n_unknown_dice, roll_prob)
+    tail = np.append(np.cumsum(pmf[::-1])[::-1], 0.0)  # tail[k] = P(X >= k)
+    tail.flags.writeable = False  # shared between calls
+    return tail
+
+
+def determine_probability(difference, n_unknown_dice, roll_prob):
+    # determines the probability of at least n times a diceValue in m unknown dice
+    tail = tail_probabilities(n_unknown_dice, roll_prob)
+    return tail[min(max(difference, 0), n_unknown_dice + 1)]
+
+
+def bid_probabilities(face_counts, n_total_dice):
+    """
+    Computes, for every dice value and count, the probability that a bid is on the table given the own hand,
+    under the joker rules: joker dice (1) count towards every other value, so an unknown die shows a given non-joker
+    value or a joker with probability 1/3, and a joker with probability 1/6.
+    Built once per hand and number of dice on the table, then reused (e.g. for doubting and then bidding).\n
+    :param face_counts: Number of dice in the own hand with each value 1 to 6.\n
+    :param n_total_dice: Number of dice on the table, including the own hand.\n
+    :return: Read-only array indexed by [roll, count], for rolls 1 to 6 (row 0 is unused) and counts 0 to
+    n_total_dice + 1.
+    """
+    return hand_bid_probabilities(tuple([int(count) for count in face_counts]), n_total_dice)
+
+
+@lru_cache(maxsize=4096)
+def hand_bid_probabilities(face_counts, n_total_dice):
+    # See bid_probabilities, with the face counts as a (hashable) tuple
+    face_counts = np.array(face_counts)
+    n_unknown_dice = n_total_dice - int(face_counts.sum())
+
+    known = face_counts + face_counts[0]  # own dice that count towards a bid on each value, jokers included
+    known[0] = face_counts[0]
+
+    difference = np.arange(n_total_dice + 2) - known[:, None]  # dice still needed from the unknown dice
+    difference = np.clip(difference, 0, n_unknown_dice + 1)
+
+    probabilities = np.zeros((7, n_total_dice + 2))
+    probabilities[1] = tail_probabilities(n_unknown_dice, 1 / 6)[difference[0]]
+    probabilities[2:] = tail_probabilities(n_unknown_dice, 1 / 3)[difference[1:]]
+    probabilities.flags.writeable = False  # shared between calls
+    return probabilities
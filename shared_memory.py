@@ -0,0 +1,226 @@
+import numpy as np
+
+from declarative_memory import DeclarativeMemory
+from dmchunk import Chunk, content_key
+from model import Model
+
+
+class SharedMemory(object):
+    max_agents = 64  # agents are identified by a bit in a uint64 mask
+
+    def __init__(self, n_agents):
+        """
+        Declarative memory of several agents (e.g. all model players in a game) in shared columnar arrays,
+        with a single clock. Each chunk is stored once, with a bitmask of the agents that have it in DM, and each
+        encounter is stored once, with a bitmask of the agents that had it. Broadcasting an encounter to many agents
+        or advancing everyone's time is therefore a single operation.
+        Only exact base-level learning is supported (see AgentModel).
+        :param n_agents: Number of agents sharing the memory.
+        """
+        if n_agents > self.max_agents:
+            raise ValueError("SharedMemory supports at most %d agents" % self.max_agents)
+
+        self.n_agents = n_agents
+        self.time = 0
+        self.version = 0  # Incremented whenever chunks, encounters or fans change
+
+        self.dm = DeclarativeMemory()  # All chunks of all agents
+        self.rows = {}  # Chunk -> row in the chunk columns
+        self.members = np.zeros(16, dtype=np.uint64)  # Per chunk: mask of the agents that have it in DM
+        self.last_encounter = np.zeros(16, dtype=np.intp)  # Per chunk: index of its latest encounter
+
+        self.n_encounters = 0
+        self.encounter_times = np.empty(64)
+        self.encounter_rows = np.empty(64, dtype=np.intp)
+        self.encounter_agents = np.zeros(64, dtype=np.uint64)  # Per encounter: mask of the agents that had it
+
+        # Base-level activation sums (chunk x agent), valid as long as baselevel_key does not change
+        self.baselevel_sums = None
+        self.baselevel_key = None
+
+    def agent_mask(self, agents):
+        mask = 0
+        for agent in agents:
+            mask |= 1 << agent
+        return np.uint64(mask)
+
+    def add_encounter(self, chunk, agents):
+        """
+        Add an encounter of the specified chunk at the current time for all of the specified agents.
+        If the chunk does not exist yet, create it first.
+        """
+        mask = self.agent_mask(agents)
+
+        existing = self.dm.get(chunk.name)
+        if existing is None:
+            existing = chunk
+            self.dm.add(chunk)
+            row = len(self.rows)
+            self.rows[chunk] = row
+            if row == len(self.members):
+                self.members = np.concatenate([self.members, np.zeros_like(self.members)])
+                self.last_encounter = np.concatenate([self.last_encounter, np.zeros_like(self.last_encounter)])
+            self.last_encounter[row] = -1
+
+            # Increment the fan of all chunks that this chunk references in its slots
+            for value in set(chunk.slots.values()):
+                ref = self.dm.get(value)
+                if ref is not None:
+                    ref.fan += 1
+
+        elif existing.slots != chunk.slots:
+            raise ValueError(
+                "Trying to add an encounter to a chunk with the same name (%s) but different slots and/or slot values" % chunk.name)
+
+        row = self.rows[existing]
+        self.members[row] |= mask
+
+        # Agents that encounter the chunk again at the same time share the same encounter
+        last = self.last_encounter[row]
+        if last >= 0 and self.encounter_times[last] == self.time:
+            self.encounter_agents[last] |= mask
+        else:
+            if self.n_encounters == len(self.encounter_times):
+                self.encounter_times = np.concatenate([self.encounter_times, np.empty_like(self.encounter_times)])
+                self.encounter_rows = np.concatenate([self.encounter_rows, np.empty_like(self.encounter_rows)])
+                self.encounter_agents = np.concatenate([self.encounter_agents, np.zeros_like(self.encounter_agents)])
+            self.encounter_times[self.n_encounters] = self.time
+            self.encounter_rows[self.n_encounters] = row
+            self.encounter_agents[self.n_encounters] = mask
+            self.last_encounter[row] = self.n_encounters
+            self.n_encounters += 1
+
+        self.version += 1
+        return existing
+
+    def add_encounter_by_content(self, slots, agents):
+        """
+        Add an encounter of the chunk with the specified slots for all of the specified agents (see
+        Model.add_encounter_by_content).
+        """
+        chunk = self.dm.get_by_content(slots)
+        if chunk is None:
+            chunk = Chunk(name=content_key(slots), slots=slots)
+        return self.add_encounter(chunk, agents)
+
+    def get_baselevel_sums(self, d):
+        """
+        Get the summed decay of the past encounters of every chunk for every agent at the current time, as a
+        (chunk x agent) array. All encounters are decayed at once and the result is reused until the time or DM
+        changes, so it is shared by all agents' retrievals at the same time.
+        """
+        key = (self.time, self.version, d)
+        if key == self.baselevel_key:
+            return self.baselevel_sums
+
+        times = self.encounter_times[:self.n_encounters]
+        past = np.flatnonzero(times < self.time)
+        decay = (self.time - times[past]) ** -d
+
+        agent_bits = np.arange(self.n_agents, dtype=np.uint64)
+        had = (self.encounter_agents[past, None] >> agent_bits) & np.uint64(1)
+        encounter_idx, agent_idx = np.nonzero(had)
+        cells = self.encounter_rows[past][encounter_idx] * self.n_agents + agent_idx
+
+        self.baselevel_sums = np.bincount(cells, weights=decay[encounter_idx],
+                                          minlength=len(self.rows) * self.n_agents).reshape(-1, self.n_agents)
+        self.baselevel_key = key
+        return self.baselevel_sums
+
+    def get_baselevel_activations(self, chunks, agent, d):
+        """
+        Get the base-level activation of the specified chunks for one agent at the current time, as an array
+        """
+        rows = np.fromiter([self.rows[ch] for ch in chunks], dtype=np.intp, count=len(chunks))
+        sums = self.get_baselevel_sums(d)[rows, agent]
+
+        # There should be at least one past encounter of each chunk
+        if not sums.all():
+            chunk = chunks[int(np.argmin(sums))]
+            raise ValueError("Chunk %s not encountered at or before time %s" % (str(chunk.name), str(self.time)))
+
+        return np.log(sums)
+
+
+class AgentMemory(object):
+
+    def __init__(self, memory, agent):
+        """
+        The chunks of a SharedMemory that one agent has in DM, with the same interface as DeclarativeMemory.
+        """
+        self.memory = memory
+        self.bit = np.uint64(1 << agent)
+
+    def has(self, chunk):
+        row = self.memory.rows.get(chunk)
+        return row is not None and bool(self.memory.members[row] & self.bit)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.memory.members[:len(self.memory.rows)] & self.bit))
+
+    def __iter__(self):
+        return iter([ch for ch in self.memory.dm if self.has(ch)])
+
+    def __contains__(self, chunk):
+        return chunk in self.memory.dm and self.has(chunk)
+
+    def get(self, name):
+        chunk = self.memory.dm.get(name)
+        return chunk if chunk is not None and self.has(chunk) else None
+
+    def get_by_content(self, slots):
+        chunk = self.memory.dm.get_by_content(slots)
+        return chunk if chunk is not None and self.has(chunk) else None
+
+    def matching(self, slots):
+        return [ch for ch in self.memory.dm.matching(slots) if self.has(ch)]
+
+
+class AgentModel(Model):
+
+    def __init__(self, memory, agent, seed=None):
+        """
+        A model whose declarative memory and clock are part of a SharedMemory. Retrieval works as in Model, with
+        the agent's own goal and noise stream. Chunk fans are shared by all agents.
+        :param memory: The SharedMemory.
+        :param agent: Index of this model's agent in the shared memory.
+        """
+        if self.ol is not None:
+            raise ValueError("Models in a SharedMemory only support exact base-level learning (ol must be None)")
+        if self.forgetting or self.capacity is not None:
+            raise ValueError("Models in a SharedMemory do not support forgetting or a DM capacity")
+
+        self.memory = memory
+        self.agent = agent
+        self.init_state(seed)
+
+    @property
+    def time(self):
+        return self.memory.time
+
+    @time.setter
+    def time(self, value):
+        self.memory.time = value
+
+    @property
+    def dm(self):
+        return AgentMemory(self.memory, self.agent)
+
+    @property
+    def fan_version(self):
+        return self.memory.version  # Any change to the shared memory invalidates the cached activations
+
+    def add_encounter(self, chunk):
+        self.memory.add_encounter(chunk, [self.agent])
+
+    def add_encounter_by_content(self, slots):
+        return self.memory.add_encounter_by_content(slots, [self.agent])
+
+    def get_baselevel_activations(self, chunks):
+        return self.memory.get_baselevel_activations(chunks, self.agent, self.d)
+
+    def forget(self, keep=None):
+        raise TypeError("forget is not supported for models in a SharedMemory")
+
+    def save(self, path):
+        raise TypeError("save (snapshots) is not supported for models in a SharedMemory")
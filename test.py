@@ -3,21 +3,10 @@ import random
 from dmchunk import Chunk
 from game import Game
 from model import Model
-from scipy.stats import binom
 import numpy as np
 import random
 
 
-def determine_probability(difference, n_unknown_dice, roll_prob):
-    # determines the probability of at least n times a diceValue in m unknown dice
-
-    p = 0
-    for k in range(difference, n_unknown_dice + 1):
-        p += binom.pmf(k, n_unknown_dice, roll_prob)
-
-    return p
-
-
 def most_common(lst):
     return max(set(lst), key=lst.count)
 
@@ -106,6 +95,27 @@ def test():
     # game.play()
 
 
+def test_bll_approximation():
+    # The hybrid base-level approximation (Model.ol) should stay close to the exact base-level activation
+    random.seed(0)
+    for _ in range(100):
+        m = Model()
+        ch = Chunk(name="bid_memory1", slots={"type": "bid_memory", "player": 1, "dice_value": 5})
+        for _ in range(random.randint(1, 300)):
+            m.add_encounter(ch)
+            m.time += random.uniform(2.5, 4)  # add time according to length of a turn
+        m.time += random.uniform(0, 50)
+
+        m.ol = None
+        exact = m.get_activation_no_noise(ch)
+        for ol, max_error in [(1, 0.1), (3, 0.05), (10, 0.05)]:
+            m.ol = ol
+            error = abs(m.get_activation_no_noise(ch) - exact)
+            assert error < max_error, f'ol={ol}: error {error} exceeds {max_error}'
+
+    print('base-level approximation within bounds')
+
+
 def test2():
     for x in range(1, 100):
         y = np.log(x * 2) + random.uniform(1, 1.5)
@@ -114,4 +124,5 @@ def test2():
     print(np.sort([2,3,1]))
 
 if __name__ == '__main__':
+    test_bll_approximation()
     test2()
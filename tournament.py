@@ -0,0 +1,129 @@
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+from game import Game, difficulties
+
+
+def play_game(settings):
+    """
+    Plays one seeded headless game.\n
+    :param settings: (seed, strategies, n_starting_dice) of the game, with a strategy per player.\n
+    :return: dict with the results of the game.
+    """
+    seed, strategies, n_starting_dice = settings
+    game = Game(n_players=len(strategies), n_starting_dice=n_starting_dice, headless=True, strategies=strategies,
+                seed=seed)
+    winners = game.play()
+    return {'seed': seed,
+            'strategies': strategies,
+            'winners': winners,
+            'rounds': game.round,
+            'retrievals': game.chunk_retrieval_count,
+            'retrieval_failures': game.chunk_retrieval_failure_count}
+
+
+class TournamentResults(object):
+
+    def __init__(self):
+        """
+        Aggregated results of the games in a tournament, to which the results of single games are merged.
+        """
+        self.n_games = 0
+        self.n_rounds = 0
+        self.wins = Counter()  # player -> number of games won (players can win a game together)
+        self.strategy_wins = Counter()  # strategy -> number of games won by a player with that strategy
+        self.strategy_seats = Counter()  # strategy -> number of games played by a player with that strategy
+        self.retrievals = 0
+        self.retrieval_failures = 0
+
+    def merge(self, result):
+        """
+        Add the results of one game (see play_game).
+        """
+        self.n_games += 1
+        self.n_rounds += result['rounds']
+        self.wins.update(result['winners'])
+        self.strategy_wins.update([result['strategies'][winner] for winner in result['winners']])
+        self.strategy_seats.update(result['strategies'])
+        self.retrievals += result['retrievals']
+        self.retrieval_failures += result['retrieval_failures']
+
+    @property
+    def win_rates(self):
+        return dict([(player, wins / self.n_games) for player, wins in sorted(self.wins.items())])
+
+    @property
+    def strategy_win_rates(self):
+        return dict([(strategy, self.strategy_wins[strategy] / seats)
+                     for strategy, seats in sorted(self.strategy_seats.items())])
+
+    @property
+    def rounds_per_game(self):
+        return self.n_rounds / self.n_games
+
+    @property
+    def retrieval_success_rate(self):
+        n_tries = self.retrievals + self.retrieval_failures
+        return self.retrievals / n_tries if n_tries else None
+
+    def __str__(self):
+        return "Games: " + str(self.n_games) + "\n" \
+               "Win rates: " + str(self.win_rates) + "\n" \
+               "Win rates per strategy: " + str(self.strategy_win_rates) + "\n" \
+               "Rounds per game: " + str(self.rounds_per_game) + "\n" \
+               "Retrievals: " + str(self.retrievals) + ", failures: " + str(self.retrieval_failures) + "\n"
+
+
+class Tournament(object):
+
+    def __init__(self, n_games, strategies=('model', 'model', 'model', 'model'), n_starting_dice=5, seed=0,
+                 processes=None):
+        """
+        A number of seeded headless games between the same players, spread over a pool of processes.\n
+        :param n_games: Number of games to play.\n
+        :param strategies: Strategy of each player ('random' or 'model'), which also sets the number of players.\n
+        :param n_starting_dice: Number of dice each player starts with.\n
+        :param seed: Seed of the first game, the following games get the next seeds.\n
+        :param processes: Number of worker processes (None: one per core).
+        """
+        if len(strategies) < 2:
+            raise ValueError(f"A game needs at least 2 players, got {len(strategies)}")
+        unknown = [strategy for strategy in strategies if strategy not in difficulties]
+        if unknown:
+            raise ValueError(f"Unknown strategies {unknown}, expected one of {list(difficulties)}")
+        if n_starting_dice < 1:
+            raise ValueError(f"Players need at least 1 starting die, got {n_starting_dice}")
+
+        self.n_games = n_games
+        self.strategies = list(strategies)
+        self.n_starting_dice = n_starting_dice
+        self.seed = seed
+        self.processes = processes
+
+    def games(self):
+        for game in range(self.n_games):
+            yield self.seed + game, self.strategies, self.n_starting_dice
+
+    def results(self):
+        """
+        Play the games and yield the result of each game (see play_game) as soon as it is finished, in any order.
+        """
+        processes = self.processes or os.cpu_count()
+        with Pool(processes) as pool:
+            chunksize = max(1, self.n_games // (4 * processes))  # a few chunks per process, to balance the load
+            for result in pool.imap_unordered(play_game, self.games(), chunksize=chunksize):
+                yield result
+
+    def run(self):
+        """
+        Play the games and return the aggregated TournamentResults.
+        """
+        results = TournamentResults()
+        for result in self.results():
+            results.merge(result)
+        return results
+
+
+if __name__ == '__main__':
+    print(Tournament(n_games=1000, strategies=['random', 'model', 'model', 'model']).run())